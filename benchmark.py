@@ -0,0 +1,303 @@
+# benchmark.py
+# ---------------------------------------------------------
+# BENCHMARK SUITE
+# Reproducible timings for the grading core, the UI calculation path
+# and PDF rendering, on synthetic cohorts of several sizes.
+#
+#   python benchmark.py -o bench.json                 # run and save
+#   python benchmark.py --compare bench.json          # run and flag regressions
+#   python benchmark.py --stages startup              # cold start of the UI module only
+# ---------------------------------------------------------
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from core import (RunningTotals, SubjectData, SubjectInput, calculate_batch, calculate_final_average,
+                  classify_batch, get_classification)
+
+SIZES = {"1": 1, "1k": 1000, "100k": 100000}
+SUBJECT_COUNTS = [1, 10, 50]
+STAGES = ["subject_calculate", "classification", "calculate_results", "batch_engine", "pdf_generate", "startup"]
+# Stages measuring the app itself: run once, not per cohort size
+APP_STAGES = {"startup"}
+# Stages processing the whole cohort in one call: no per-student latency, only the run's
+VECTOR_STAGES = {"batch_engine"}
+
+# PDF rendering is ~1000x slower than the math: only render a sample per size
+PDF_SAMPLE = 200
+# Relative change that counts as a regression in --compare
+DEFAULT_THRESHOLD = 0.15
+
+
+# --- SYNTHETIC DATA ---
+
+def make_student(rng, n_subjects):
+    """One student's raw inputs: (name, coeff, grades) per subject, 1-4 exams each."""
+    return [(f"Subject {j}", rng.randint(1, 10), [round(rng.uniform(0, 20), 2) for _ in range(rng.randint(1, 4))])
+            for j in range(1, n_subjects + 1)]
+
+
+def iter_cohort(n_students, n_subjects, seed=42):
+    """Yields the same synthetic students for the same seed, without holding the cohort."""
+    rng = random.Random(seed)
+    for _ in range(n_students):
+        yield make_student(rng, n_subjects)
+
+
+def to_subjects(student):
+    return [SubjectData(j, name, coeff, grades) for j, (name, coeff, grades) in enumerate(student, start=1)]
+
+
+# --- STAGES (each returns per-item latencies in seconds, vector stages one run latency) ---
+
+def bench_subject_calculate(n_students, n_subjects, seed):
+    timings = []
+    for student in iter_cohort(n_students, n_subjects, seed):
+        subjects = to_subjects(student)
+        t0 = time.perf_counter()
+        for s in subjects:
+            s.calculate()
+        timings.append(time.perf_counter() - t0)
+    return timings
+
+
+def bench_classification(n_students, n_subjects, seed):
+    rng = random.Random(seed)
+    averages = [rng.uniform(0, 20) for _ in range(n_students)]
+    timings = []
+    for avg in averages:
+        t0 = time.perf_counter()
+        get_classification(avg)
+        timings.append(time.perf_counter() - t0)
+    return timings
+
+
+def bench_calculate_results(n_students, n_subjects, seed):
+    """
+    The path behind CALCULATE RESULTS: raw text inputs -> validation -> running totals -> tier,
+    through the same SubjectInput.to_subject and RunningTotals.update calls as the UI.
+    """
+    timings = []
+    for student in iter_cohort(n_students, n_subjects, seed):
+        inputs = [SubjectInput(j, name, coeff, [str(g) for g in grades])
+                  for j, (name, coeff, grades) in enumerate(student, start=1)]
+        t0 = time.perf_counter()
+        totals = RunningTotals()
+        for model in inputs:
+            totals.update(model.index, model.to_subject())
+        get_classification(totals.final_average)
+        timings.append(time.perf_counter() - t0)
+    return timings
+
+
+def make_arrays(n_students, n_subjects, seed):
+    """Synthetic cohort with the same distribution as iter_cohort, generated directly as arrays."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    grades = np.round(rng.uniform(0, 20, (n_students, n_subjects, 4)), 2)
+    exam_counts = rng.integers(1, 5, (n_students, n_subjects))
+    mask = np.arange(4) < exam_counts[:, :, None]
+    coeffs = rng.integers(1, 11, (n_students, n_subjects)).astype(np.float64)
+    return grades, mask, coeffs
+
+
+def bench_batch_engine(n_students, n_subjects, seed):
+    grades, mask, coeffs = make_arrays(n_students, n_subjects, seed)
+    t0 = time.perf_counter()
+    _, _, final_averages = calculate_batch(grades, mask, coeffs)
+    classify_batch(final_averages)
+    return [time.perf_counter() - t0]
+
+
+def bench_pdf_generate(n_students, n_subjects, seed):
+    from pdf_service import PDFReportGenerator
+
+    generator = PDFReportGenerator()
+    timings = []
+    for student in iter_cohort(min(n_students, PDF_SAMPLE), n_subjects, seed):
+        subjects = to_subjects(student)
+        t0 = time.perf_counter()
+        avg = calculate_final_average(subjects)
+        generator.render_bytes(subjects, avg, get_classification(avg)[0])
+        timings.append(time.perf_counter() - t0)
+    return timings
+
+
+def bench_startup(n_students, n_subjects, seed, runs=5):
+    """
+    Cold import of the UI module (main.py) in fresh interpreters.
+    Time to first render needs a Flet client: run the app with ACADEMIC_PRO_INSTRUMENT=1
+    and read startup.first_render / startup.total from the summary.
+    """
+    code = ("import sys, time; t = time.perf_counter(); import main; "
+            "print(time.perf_counter() - t, 'reportlab' in sys.modules)")
+    here = os.path.dirname(os.path.abspath(__file__))
+    timings = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", code], cwd=here, capture_output=True, text=True,
+                             check=True).stdout.split()
+        if out[-1] == "True": raise RuntimeError("main.py imports ReportLab at startup.")
+        timings.append(float(out[-2]))
+    return timings
+
+
+BENCHES = {
+    "subject_calculate": bench_subject_calculate,
+    "classification": bench_classification,
+    "calculate_results": bench_calculate_results,
+    "batch_engine": bench_batch_engine,
+    "pdf_generate": bench_pdf_generate,
+    "startup": bench_startup,
+}
+
+
+# --- MEASUREMENT ---
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+def run_stage(stage, n_students, n_subjects, seed=42, measure_memory=True, repeat=3):
+    """
+    Runs one stage and returns its result record.
+    Keeps the fastest of `repeat` runs, which filters out warm-up and scheduler noise.
+    Vector stages report the run latency (run_ms) and leave the percentiles None.
+    """
+    bench = BENCHES[stage]
+    timings = min((bench(n_students, n_subjects, seed) for _ in range(max(1, repeat))), key=sum)
+    timings.sort()
+    total = sum(timings)
+
+    peak_kb = None
+    if measure_memory:
+        # Separate pass: tracemalloc slows allocation down and would skew the timings
+        tracemalloc.start()
+        bench(n_students, n_subjects, seed)
+        peak_kb = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+        tracemalloc.stop()
+
+    vector = stage in VECTOR_STAGES
+    items = n_students if vector else len(timings)
+    pct = lambda q: None if vector else round(percentile(timings, q) * 1000, 6)
+    return {
+        "stage": stage,
+        "students": n_students,
+        "subjects": n_subjects,
+        "items": items,
+        "seconds": round(total, 6),
+        "throughput": round(items / total, 2) if total > 0 else None,
+        "run_ms": round(total * 1000, 6) if vector else None,
+        "p50_ms": pct(50),
+        "p95_ms": pct(95),
+        "p99_ms": pct(99),
+        "peak_mem_kb": peak_kb,
+    }
+
+
+def run_suite(sizes, subject_counts, stages, seed=42, measure_memory=True, repeat=3, on_result=None):
+    results = []
+    for stage in stages:
+        if stage in APP_STAGES:
+            # Runs in subprocesses: tracemalloc here would not see its memory
+            result = run_stage(stage, 1, 0, seed, False, repeat)
+            result["size"] = "app"
+            results.append(result)
+            if on_result:
+                on_result(result)
+            continue
+        for size in sizes:
+            for n_subjects in subject_counts:
+                result = run_stage(stage, SIZES[size], n_subjects, seed, measure_memory, repeat)
+                result["size"] = size
+                results.append(result)
+                if on_result:
+                    on_result(result)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Flags stages whose throughput dropped, or whose p95 latency (run latency for vector
+    stages) / peak memory grew, by more than threshold (relative) against the baseline report.
+    :return: List of regression messages
+    """
+    key = lambda r: (r["stage"], r["students"], r["subjects"])
+    base = {key(r): r for r in baseline["results"]}
+    regressions = []
+    for r in current["results"]:
+        b = base.get(key(r))
+        if not b:
+            continue
+        label = f"{r['stage']} [{r['students']} students x {r['subjects']} subjects]"
+        if b["throughput"] and r["throughput"] and r["throughput"] < b["throughput"] * (1 - threshold):
+            regressions.append(f"{label}: throughput {b['throughput']} -> {r['throughput']} /s")
+        for field, name in (("p95_ms", "p95"), ("run_ms", "run")):
+            if b.get(field) and r.get(field) is not None and r[field] > b[field] * (1 + threshold):
+                regressions.append(f"{label}: {name} {b[field]} -> {r[field]} ms")
+        if b.get("peak_mem_kb") and r.get("peak_mem_kb") and r["peak_mem_kb"] > b["peak_mem_kb"] * (1 + threshold):
+            regressions.append(f"{label}: peak memory {b['peak_mem_kb']} -> {r['peak_mem_kb']} KB")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark grading, classification and PDF rendering.")
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument("--subjects", nargs="+", type=int, default=SUBJECT_COUNTS)
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per stage, the fastest is kept")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the peak memory pass")
+    parser.add_argument("-o", "--output", default=None, help="Write results JSON here")
+    parser.add_argument("--compare", default=None, help="Baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Relative regression threshold")
+    args = parser.parse_args(argv)
+
+    def on_result(r):
+        if r["run_ms"] is not None:
+            latency = f"run {r['run_ms']:.4f}ms"
+        else:
+            latency = f"p50 {r['p50_ms']:.4f}ms  p95 {r['p95_ms']:.4f}ms  p99 {r['p99_ms']:.4f}ms"
+        print(f"{r['stage']:<18} {r['students']:>7} x {r['subjects']:<3} "
+              f"{r['throughput'] or 0:>12.1f}/s  {latency}  peak {r['peak_mem_kb']} KB", flush=True)
+
+    report = run_suite(args.sizes, args.subjects, args.stages, args.seed, not args.no_memory, args.repeat,
+                       on_result)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for msg in regressions:
+            print(f"REGRESSION {msg}")
+        if regressions:
+            return 1
+        print("No regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+# bulk_reports.py
+# ---------------------------------------------------------
+# BULK PDF REPORT GENERATION
+# Spreads PDFReportGenerator work across a process pool.
+# No UI libraries (Flet) allowed here.
+# ---------------------------------------------------------
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from core import build_subjects, calculate_final_average, get_classification
+from headless import read_cohort
+from pdf_service import PDFReportGenerator
+from result_cache import ResultCache, pdf_key
+
+# One generator (and optional disk-backed cache) per worker process, set by _init_worker
+_worker_generator = None
+_worker_cache = None
+
+
+class ReportJob:
+    """A single student's report to render."""
+
+    def __init__(self, index, student_id, subjects, error=None):
+        self.index = index
+        self.student_id = str(student_id)
+        self.subjects = subjects
+        # Validation error found while loading; the job is reported as failed
+        self.error = error
+
+
+class ReportResult:
+    """Outcome of one ReportJob, streamed back to the caller."""
+
+    def __init__(self, index, student_id, success, message, path, average, classification, seconds,
+                 pdf_bytes=None):
+        self.index = index
+        self.student_id = student_id
+        self.name = report_filename(index, student_id)
+        self.success = success
+        self.message = message
+        self.path = path
+        self.average = average
+        self.classification = classification
+        self.seconds = seconds
+        # Only set for in-memory renders (out_dir=None)
+        self.pdf_bytes = pdf_bytes
+
+    def to_dict(self):
+        return {
+            "index": self.index,
+            "student": self.student_id,
+            "name": self.name,
+            "success": self.success,
+            "message": self.message,
+            "path": self.path,
+            "average": self.average,
+            "classification": self.classification,
+            "seconds": round(self.seconds, 4),
+        }
+
+
+def report_filename(index, student_id):
+    """Deterministic, collision-free file name for the n-th report of a batch."""
+    safe_id = re.sub(r"[^A-Za-z0-9_.-]+", "_", str(student_id)).strip("._") or "student"
+    return f"Report_{index:05d}_{safe_id}.pdf"
+
+
+def load_students(filepath):
+    """
+    Reads a cohort CSV or JSON file (formats in headless.read_cohort).
+    Students that fail validation become failed jobs instead of aborting the batch.
+    :return: List of ReportJob
+    """
+    jobs = []
+    for i, (student_id, raw_subjects) in enumerate(read_cohort(filepath)):
+        try:
+            subjects = build_subjects(raw_subjects)
+            jobs.append(ReportJob(i, student_id, subjects))
+        except ValueError as err:
+            jobs.append(ReportJob(i, student_id, [], str(err)))
+    return jobs
+
+
+def _init_worker(cache_dir=None):
+    global _worker_generator, _worker_cache
+    _worker_generator = PDFReportGenerator()
+    _worker_cache = ResultCache(max_entries=16, disk_dir=cache_dir) if cache_dir else None
+
+
+def _render_job(job, out_dir):
+    """
+    Runs inside a worker process: computes results and renders one PDF.
+    With out_dir=None the PDF is returned as bytes instead of written to disk.
+    """
+    start = time.perf_counter()
+    path = os.path.join(out_dir, report_filename(job.index, job.student_id)) if out_dir else None
+    avg, text, pdf_bytes = None, None, None
+    try:
+        if job.error: raise ValueError(job.error)
+        if _worker_cache is not None:
+            avg, text, _ = _worker_cache.results(job.subjects)
+        else:
+            avg = calculate_final_average(job.subjects)
+            text, _ = get_classification(avg)
+
+        generator = _worker_generator or PDFReportGenerator()
+        if _worker_cache is not None:
+            # Reports already rendered by an earlier (possibly crashed) run come from the disk tier
+            key = pdf_key(job.subjects)
+            pdf_bytes = _worker_cache.get_pdf(key)
+            msg = "Cached"
+            if pdf_bytes is None:
+                pdf_bytes = generator.render_bytes(job.subjects, avg, text)
+                _worker_cache.put_pdf(key, pdf_bytes)
+                msg = "Success"
+            if path:
+                with open(path, "wb") as f:
+                    f.write(pdf_bytes)
+                pdf_bytes = None
+            success = True
+        elif path:
+            success, msg = generator.generate(job.subjects, avg, text, path)
+        else:
+            pdf_bytes = generator.render_bytes(job.subjects, avg, text)
+            success, msg = True, "Success"
+    except Exception as e:
+        success, msg = False, str(e)
+    return ReportResult(job.index, job.student_id, success, msg, path if success else None, avg, text,
+                        time.perf_counter() - start, pdf_bytes)
+
+
+def generate_reports(jobs, out_dir=None, workers=None, max_pending=None, cache_dir=None):
+    """
+    Renders many reports in parallel and yields a ReportResult as each one finishes.
+    :param jobs: Iterable of ReportJob (consumed lazily)
+    :param out_dir: Directory for the PDF files, or None to return them in ReportResult.pdf_bytes
+    :param workers: Process count (default: os.cpu_count())
+    :param max_pending: Max jobs in flight, bounds memory (default: 4 per worker)
+    :param cache_dir: Disk cache of rendered PDFs; reruns skip reports whose inputs are unchanged
+    """
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 4
+
+    jobs = iter(jobs)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(cache_dir,)) as pool:
+        pending = set()
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < max_pending:
+                job = next(jobs, None)
+                if job is None:
+                    exhausted = True
+                    break
+                pending.add(pool.submit(_render_job, job, out_dir))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                yield fut.result()
+
+
+def run_batch(jobs, out_dir, workers=None, on_progress=None, manifest_name="manifest.json", cache_dir=None):
+    """
+    Renders every job and writes a summary manifest into out_dir.
+    :param on_progress: Optional callback(done_count, ReportResult)
+    :return: Manifest dict
+    """
+    start = time.perf_counter()
+    results = []
+    for result in generate_reports(jobs, out_dir, workers, cache_dir=cache_dir):
+        results.append(result)
+        if on_progress:
+            on_progress(len(results), result)
+
+    manifest = _build_manifest(results, start)
+    with open(os.path.join(out_dir, manifest_name), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def write_zip(jobs, target, workers=None, on_progress=None, manifest_name="manifest.json", cache_dir=None):
+    """
+    Renders every job in memory and streams the PDFs straight into one ZIP archive.
+    No temporary files are written; each PDF is dropped once it is in the archive.
+    :param target: ZIP file path, or a writable binary stream (e.g. io.BytesIO)
+    :param on_progress: Optional callback(done_count, ReportResult)
+    :return: Manifest dict (also stored in the archive)
+    """
+    start = time.perf_counter()
+    results = []
+    with zipfile.ZipFile(target, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for result in generate_reports(jobs, None, workers, cache_dir=cache_dir):
+            if result.success:
+                zf.writestr(result.name, result.pdf_bytes)
+                result.path = result.name
+            result.pdf_bytes = None
+            results.append(result)
+            if on_progress:
+                on_progress(len(results), result)
+
+        manifest = _build_manifest(results, start)
+        zf.writestr(manifest_name, json.dumps(manifest, indent=2))
+    return manifest
+
+
+def _build_manifest(results, start):
+    results.sort(key=lambda r: r.index)
+    failed = [r for r in results if not r.success]
+    return {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "total": len(results),
+        "succeeded": len(results) - len(failed),
+        "failed": len(failed),
+        "seconds": round(time.perf_counter() - start, 3),
+        "reports": [r.to_dict() for r in results],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate PDF reports for a whole cohort.")
+    parser.add_argument("input", help="Cohort CSV or JSON file")
+    parser.add_argument("-o", "--out-dir", default="reports", help="Output directory")
+    parser.add_argument("-z", "--zip", default=None, help="Write all reports into this ZIP archive instead")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("-c", "--cache-dir", default=None,
+                        help="Disk cache so reruns skip unchanged results and reports")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Only print the summary")
+    args = parser.parse_args(argv)
+
+    jobs = load_students(args.input)
+    total = len(jobs)
+
+    def on_progress(done, result):
+        if args.quiet:
+            return
+        status = "OK" if result.success else f"ERROR: {result.message}"
+        print(f"[{done}/{total}] {result.student_id}: {status}", flush=True)
+
+    if args.zip:
+        manifest = write_zip(jobs, args.zip, args.workers, on_progress, cache_dir=args.cache_dir)
+    else:
+        manifest = run_batch(jobs, args.out_dir, args.workers, on_progress, cache_dir=args.cache_dir)
+    print(f"Done: {manifest['succeeded']} succeeded, {manifest['failed']} failed in {manifest['seconds']}s")
+    return 0 if manifest["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,10 @@
 # No UI libraries (Tkinter/Flet) allowed here.
 # ---------------------------------------------------------
 
+import bisect
+import math
+from array import array
+
 # --- COLOR CONSTANTS (Hex codes for UI consistency) ---
 COLOR_DANGER = "#d63031"
 COLOR_WARNING = "#fdcb6e"
@@ -12,6 +16,10 @@ COLOR_VERY_GOOD = "#a29bfe"
 COLOR_LEGENDARY = "#a29bfe"
 COLOR_ELITE = "#ffeaa7"
 
+# Coefficient range of the input view's slider
+COEFF_MIN = 1
+COEFF_MAX = 10
+
 
 class SubjectData:
     """
@@ -36,20 +44,617 @@ class SubjectData:
         self.weighted_score = self.average * self.coeff
 
 
-def get_classification(average):
+class SlottedSubjectData:
+    """
+    SubjectData without a per-instance __dict__.
+    Same attributes and calculate(); use it when many subjects stay in memory.
+    """
+
+    __slots__ = ("index", "name", "coeff", "grades", "average", "weighted_score")
+
+    __init__ = SubjectData.__init__
+    calculate = SubjectData.calculate
+
+
+class PackedSubjects:
+    """
+    Many subjects stored column-wise in contiguous arrays:
+    names, coefficients, grades (one flat array('d') + offsets), averages and weighted scores.
+    Indexing yields SubjectView objects that read like SubjectData.
+    """
+
+    def __init__(self):
+        self.indices = array("l")
+        self.names = []
+        self.coeffs = array("l")
+        self.grades = array("d")
+        self.offsets = array("q", [0])  # grades of subject i: grades[offsets[i]:offsets[i + 1]]
+        self.averages = array("d")
+        self.weighted_scores = array("d")
+
+    @classmethod
+    def from_subjects(cls, subjects):
+        packed = cls()
+        for s in subjects:
+            packed.append(s.index, s.name, s.coeff, s.grades)
+        packed.calculate()
+        return packed
+
+    def append(self, index, name, coeff, grades):
+        self.indices.append(index)
+        self.names.append(name)
+        self.coeffs.append(coeff)
+        self.grades.extend(grades)
+        self.offsets.append(len(self.grades))
+        self.averages.append(0.0)
+        self.weighted_scores.append(0.0)
+
+    def calculate(self, start=0, stop=None):
+        """Same math as SubjectData.calculate(), for subjects start..stop."""
+        stop = len(self) if stop is None else stop
+        grades, offsets = self.grades, self.offsets
+        for i in range(start, stop):
+            lo, hi = offsets[i], offsets[i + 1]
+            avg = sum(grades[lo:hi]) / (hi - lo) if hi > lo else 0.0
+            self.averages[i] = avg
+            self.weighted_scores[i] = avg * self.coeffs[i]
+
+    def final_average(self, start=0, stop=None):
+        """Coefficient-weighted average of subjects start..stop (e.g. one student's range)."""
+        stop = len(self) if stop is None else stop
+        # fsum, like calculate_final_average: a rounded total can land just under a tier bound
+        total_w = math.fsum(self.weighted_scores[start:stop])
+        total_c = sum(self.coeffs[start:stop])
+        return total_w / total_c if total_c > 0 else 0
+
+    def views(self, start=0, stop=None):
+        """SubjectView list for subjects start..stop, e.g. to pass to PDFReportGenerator."""
+        stop = len(self) if stop is None else stop
+        return [SubjectView(self, i) for i in range(start, stop)]
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, i):
+        if i < 0: i += len(self)
+        if not 0 <= i < len(self): raise IndexError(i)
+        return SubjectView(self, i)
+
+    def __iter__(self):
+        return (SubjectView(self, i) for i in range(len(self)))
+
+
+class SubjectView:
+    """Read-only SubjectData-compatible view of one subject inside PackedSubjects."""
+
+    __slots__ = ("_packed", "_i")
+
+    def __init__(self, packed, i):
+        self._packed = packed
+        self._i = i
+
+    @property
+    def index(self):
+        return self._packed.indices[self._i]
+
+    @property
+    def name(self):
+        return self._packed.names[self._i]
+
+    @property
+    def coeff(self):
+        return self._packed.coeffs[self._i]
+
+    @property
+    def grades(self):
+        p, i = self._packed, self._i
+        return p.grades[p.offsets[i]:p.offsets[i + 1]].tolist()
+
+    @property
+    def average(self):
+        return self._packed.averages[self._i]
+
+    @property
+    def weighted_score(self):
+        return self._packed.weighted_scores[self._i]
+
+    def calculate(self):
+        self._packed.calculate(self._i, self._i + 1)
+
+
+def build_subject(index, name, coeff, raw_grades):
+    """
+    Validates raw subject inputs (as typed in the UI or read from a file).
+    Same rules as the input view: name required, a whole coefficient in 1-10 (the slider's range),
+    a non-empty list of grades (the input view has 1-4 required exam fields), every grade a number in 0-20.
+    :return: SubjectData
+    :raises ValueError: With the message shown to the user
+    """
+    name = "" if name is None else str(name).strip()
+    if not name: raise ValueError(f"Subject #{index} name is missing.")
+    try:
+        if isinstance(coeff, bool): raise ValueError
+        value = float(coeff)
+        if value != int(value): raise ValueError
+        coeff = int(value)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f"Invalid coefficient in '{name}'")
+    if not (COEFF_MIN <= coeff <= COEFF_MAX): raise ValueError(f"Invalid coefficient in '{name}' (Must be 1-10)")
+    if not isinstance(raw_grades, (list, tuple)): raise ValueError(f"Invalid grades in '{name}' (Must be a list)")
+    if not raw_grades: raise ValueError(f"No grades in '{name}' (At least one is needed)")
+    grades = []
+    for raw in raw_grades:
+        try:
+            if raw is None or raw == "": raise ValueError
+            val = float(raw)
+            if not (0 <= val <= 20): raise ValueError
+            grades.append(val)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid grade in '{name}' (Must be 0-20)")
+    return SubjectData(index, name, coeff, grades)
+
+
+def build_subject_record(index, raw):
+    """Validates one subject record from a file or request ({"name", "coeff", "grades"}). Raises ValueError."""
+    if not isinstance(raw, dict): raise ValueError(f"Subject #{index} must be an object.")
+    return build_subject(index, raw.get("name"), raw.get("coeff", 1), raw.get("grades", []))
+
+
+def build_subjects(raw_subjects):
+    """Validates one student's list of subject records. Returns SubjectData list, raises ValueError."""
+    if not isinstance(raw_subjects, list): raise ValueError("'subjects' must be a list.")
+    if not raw_subjects: raise ValueError("No subjects (At least one is needed).")
+    return [build_subject_record(i, raw) for i, raw in enumerate(raw_subjects, start=1)]
+
+
+class SubjectInput:
+    """
+    Raw, unvalidated inputs of one subject card.
+    Kept outside the widgets so cards can be built (or not) independently of the data.
+    """
+
+    __slots__ = ("index", "name", "coeff", "grades")
+
+    def __init__(self, index, name="", coeff=1, grades=None):
+        self.index = index
+        self.name = name
+        self.coeff = coeff
+        self.grades = grades if grades else [""]  # Raw text, one entry per exam
+
+    def set_exam_count(self, count):
+        """Resizes the exam list, keeping the grades already typed."""
+        self.grades = (self.grades + [""] * count)[:count]
+
+    def to_subject(self):
+        """Validates the inputs. Returns SubjectData, raises ValueError."""
+        return build_subject(self.index, self.name, self.coeff, self.grades)
+
+
+def calculate_final_average(subjects):
+    """
+    Calculates every subject, then the coefficient-weighted final average.
+    Returns 0 when the total coefficient is 0.
+    """
+    for s in subjects:
+        s.calculate()
+    # fsum: exact total, so equal grades always give exactly a tier bound (e.g. 14.0, not 13.999...)
+    total_w = math.fsum(s.weighted_score for s in subjects)
+    total_c = sum(s.coeff for s in subjects)
+    return total_w / total_c if total_c > 0 else 0
+
+
+class RunningTotals:
+    """
+    Calculated subjects patched one at a time: only the changed subject is recalculated.
+    The weighted total is summed exactly (math.fsum) from the stored subjects on demand;
+    a float kept up to date by adding and subtracting would drift off tier bounds.
+    """
+
+    def __init__(self):
+        self.subjects = {}  # index -> calculated SubjectData
+        self.total_c = 0
+
+    def set(self, index, subject):
+        """Stores a calculated SubjectData for index (None removes it)."""
+        old = self.subjects.pop(index, None)
+        if old is not None:
+            self.total_c -= old.coeff
+        if subject is not None:
+            self.subjects[index] = subject
+            self.total_c += subject.coeff
+
+    def update(self, index, subject):
+        """
+        Recalculates a validated SubjectData (SubjectInput.to_subject()) and stores it for index.
+        None, for inputs that failed validation, removes the index.
+        """
+        if subject is not None:
+            subject.calculate()
+        self.set(index, subject)
+
+    def clear(self):
+        self.subjects.clear()
+        self.total_c = 0
+
+    @property
+    def total_w(self):
+        return math.fsum(s.weighted_score for s in self.subjects.values())
+
+    @property
+    def final_average(self):
+        return self.total_w / self.total_c if self.total_c > 0 else 0
+
+    def ordered(self):
+        """Stored subjects sorted by index."""
+        return [self.subjects[i] for i in sorted(self.subjects)]
+
+
+# --- CLASSIFICATION TIERS ---
+# (Lower bound, Classification Text, Hex Color), sorted by lower bound.
+# The first tier catches everything below the second tier's bound.
+CLASSIFICATION_TIERS = [
+    (0, "Insufficient", COLOR_DANGER),
+    (10, "Out of Danger Zone", COLOR_WARNING),
+    (11, "Good", COLOR_GOOD),
+    (14, "Very Good", COLOR_VERY_GOOD),
+    (16, "Legendary", COLOR_LEGENDARY),
+    (18, "Elite Mind", COLOR_ELITE),
+]
+
+
+class ClassificationScale:
+    """
+    Data-driven performance tiers.
+    Build one from a school's own tier table instead of editing get_classification.
+    """
+
+    def __init__(self, tiers=None):
+        tiers = sorted(tiers if tiers else CLASSIFICATION_TIERS, key=lambda t: t[0])
+        self.bounds = [t[0] for t in tiers]
+        self.labels = [t[1] for t in tiers]
+        self.colors = [t[2] for t in tiers]
+        # Thresholds that move an average up one tier
+        self.thresholds = self.bounds[1:]
+
+    def tier_index(self, average):
+        """Returns the tier index of a single average."""
+        return bisect.bisect_right(self.thresholds, average)
+
+    def classify(self, average):
+        """Returns: (Classification Text, Hex Color)"""
+        i = self.tier_index(average)
+        return self.labels[i], self.colors[i]
+
+    def classify_batch(self, averages):
+        """
+        Classifies a whole array of averages in one pass.
+        :param averages: Array-like of floats (any shape)
+        :return: (tier indices, labels, colors) as arrays of the same shape
+        """
+        import numpy as np  # Deferred: only batch callers pay the NumPy import
+
+        indices = np.searchsorted(self.thresholds, np.asarray(averages, dtype=np.float64), side="right")
+        return indices, np.asarray(self.labels, dtype=object)[indices], np.asarray(self.colors, dtype=object)[indices]
+
+
+DEFAULT_SCALE = ClassificationScale()
+
+
+def get_classification(average, scale=None):
     """
     Determines the student's performance tier based on the average.
     Returns: (Classification Text, Hex Color)
     """
-    if average < 10:
-        return "Insufficient", COLOR_DANGER
-    if 10 <= average < 11:
-        return "Out of Danger Zone", COLOR_WARNING
-    if 11 <= average < 14:
-        return "Good", COLOR_GOOD
-    if 14 <= average < 16:
-        return "Very Good", COLOR_VERY_GOOD
-    if 16 <= average < 18:
-        return "Legendary", COLOR_LEGENDARY
-
-    return "Elite Mind", COLOR_ELITE
\ No newline at end of file
+    return (scale or DEFAULT_SCALE).classify(average)
+
+
+def classify_batch(averages, scale=None):
+    """
+    Bulk version of get_classification.
+    Returns: (tier indices, labels, colors) arrays
+    """
+    return (scale or DEFAULT_SCALE).classify_batch(averages)
+
+
+# --- BATCH ENGINE (Columnar, for whole cohorts) ---
+
+def subjects_to_arrays(cohort, max_exams=4):
+    """
+    Packs a cohort into dense arrays for calculate_batch.
+    :param cohort: List (one entry per student) of SubjectData lists.
+                   Every student must have the same number of subjects.
+    :param max_exams: Exam axis size (the UI allows up to 4 exams)
+    :return: (grades, mask, coeffs) with shapes
+             (students, subjects, exams), (students, subjects, exams), (students, subjects)
+    """
+    import numpy as np
+
+    n_students = len(cohort)
+    n_subjects = len(cohort[0]) if n_students else 0
+    grades = np.zeros((n_students, n_subjects, max_exams), dtype=np.float64)
+    mask = np.zeros((n_students, n_subjects, max_exams), dtype=bool)
+    coeffs = np.zeros((n_students, n_subjects), dtype=np.float64)
+
+    for i, subjects in enumerate(cohort):
+        if len(subjects) != n_subjects:
+            raise ValueError(f"Student #{i} has {len(subjects)} subjects, expected {n_subjects}.")
+        for j, sub in enumerate(subjects):
+            n = len(sub.grades)
+            if n > max_exams:
+                raise ValueError(f"Subject '{sub.name}' has {n} exams (max {max_exams}).")
+            grades[i, j, :n] = sub.grades
+            mask[i, j, :n] = True
+            coeffs[i, j] = sub.coeff
+    return grades, mask, coeffs
+
+
+def _sum_in_order(values):
+    """Sums the last axis left to right, like sum() on each row (NumPy's .sum() is pairwise)."""
+    import numpy as np
+
+    total = np.zeros(values.shape[:-1])
+    for k in range(values.shape[-1]):
+        total += values[..., k]
+    return total
+
+
+def calculate_batch(grades, mask, coeffs):
+    """
+    Vectorized equivalent of SubjectData.calculate() + the final average logic.
+    :param grades: Float array (students, subjects, exams)
+    :param mask: Bool array, same shape, True where an exam grade is present
+    :param coeffs: Array (subjects,) shared by all students, or (students, subjects)
+    :return: (averages, weighted_scores, final_averages)
+             averages / weighted_scores are (students, subjects), final_averages is (students,)
+    """
+    import numpy as np
+
+    grades = np.asarray(grades, dtype=np.float64)
+    mask = np.asarray(mask, dtype=bool)
+    coeffs = np.broadcast_to(np.asarray(coeffs, dtype=np.float64), grades.shape[:2])
+
+    # Subject averages (0.0 when a subject has no grades, like SubjectData).
+    # Exams are added left to right, like sum(grades): NumPy's pairwise .sum() can round differently
+    counts = mask.sum(axis=2)
+    sums = _sum_in_order(np.where(mask, grades, 0.0))
+    averages = np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+    weighted_scores = averages * coeffs
+
+    # Final averages: total_w / total_c, or 0 when total_c is 0.
+    # total_w is summed exactly per student (math.fsum, like calculate_final_average): a rounded
+    # .sum(axis=1) can land just under a tier bound (10.999999999999998 instead of 11.0)
+    total_w = np.array([math.fsum(row) for row in weighted_scores.tolist()], dtype=np.float64)
+    total_c = coeffs.sum(axis=1)
+    final_averages = np.divide(total_w, total_c, out=np.zeros_like(total_w), where=total_c > 0)
+    return averages, weighted_scores, final_averages
+
+
+def cohort_statistics(cohort, scale=None):
+    """
+    Cohort-wide summary computed with the batch engine (calculate_batch + classify_batch).
+    Subjects are aligned by name, so students may list them in any order or skip some:
+    a missing subject weighs nothing in that student's final average and is left out of its statistics.
+    :param cohort: List (one entry per student) of SubjectData lists
+    :return: Dict with
+             "final_averages", "tier_indices", "labels": per-student arrays,
+             "subject_names" (first-seen order), "counts" (students per subject) and
+             "mean" / "median" / "std" (population) arrays of subject averages,
+             "tier_labels", "tier_colors" and "tier_counts" (students per tier, lowest tier first)
+    """
+    import numpy as np
+
+    if not cohort: raise ValueError("Cohort is empty.")
+    scale = scale or DEFAULT_SCALE
+
+    # Column per subject name; a name repeated within one student gets its own column ("Art (2)")
+    columns = {}
+    keyed = []
+    for subjects in cohort:
+        seen = {}
+        keys = []
+        for s in subjects:
+            n = seen[s.name] = seen.get(s.name, 0) + 1
+            key = s.name if n == 1 else f"{s.name} ({n})"
+            columns.setdefault(key, len(columns))
+            keys.append(key)
+        keyed.append(keys)
+
+    max_exams = max(1, max((len(s.grades) for subjects in cohort for s in subjects), default=1))
+    shape = (len(cohort), len(columns))
+    grades = np.zeros(shape + (max_exams,))
+    mask = np.zeros(shape + (max_exams,), dtype=bool)
+    coeffs = np.zeros(shape)
+    present = np.zeros(shape, dtype=bool)
+    for i, (subjects, keys) in enumerate(zip(cohort, keyed)):
+        for s, key in zip(subjects, keys):
+            j = columns[key]
+            grades[i, j, :len(s.grades)] = s.grades
+            mask[i, j, :len(s.grades)] = True
+            coeffs[i, j] = s.coeff
+            present[i, j] = True
+
+    averages, _, final_averages = calculate_batch(grades, mask, coeffs)
+    tier_indices, labels, _ = scale.classify_batch(final_averages)
+    # Every column has at least one student, so the nan-statistics never see an empty column
+    subject_averages = np.where(present, averages, np.nan)
+    return {
+        "final_averages": final_averages,
+        "tier_indices": tier_indices,
+        "labels": labels,
+        "subject_names": list(columns),
+        "counts": present.sum(axis=0),
+        "mean": np.nanmean(subject_averages, axis=0),
+        "median": np.nanmedian(subject_averages, axis=0),
+        "std": np.nanstd(subject_averages, axis=0),
+        "tier_labels": list(scale.labels),
+        "tier_colors": list(scale.colors),
+        "tier_counts": np.bincount(tier_indices, minlength=len(scale.labels)),
+    }
+
+
+# --- TARGET SOLVER (What-if) ---
+# Each remaining exam of subject j scored x moves its average to (S_j + r_j * x) / (n_j + r_j),
+# so the final average is linear in x: (A + B * x) / C. The required grade follows directly,
+# then is checked with the app's own calculation (float rounding can land a hair under a bound).
+
+MAX_GRADE = 20.0
+
+
+def target_average(target, scale=None):
+    """
+    Average needed for a target.
+    :param target: Tier label from get_classification (e.g. "Very Good") or a numeric average
+    """
+    if isinstance(target, (int, float)): return float(target)
+    scale = scale or DEFAULT_SCALE
+    if target not in scale.labels: raise ValueError(f"Unknown classification '{target}'")
+    return float(scale.bounds[scale.labels.index(target)])
+
+
+def _round_up(grade):
+    """Rounds a required grade up to the hundredth (the analytic value, before the _settle check)."""
+    return math.ceil(grade * 100 - 1e-9) / 100
+
+
+def _reaches(subjects, remaining, fills, goal):
+    """True when calculate_final_average reaches goal once subject j's remaining exams all score fills[j]."""
+    trial = [SubjectData(s.index, s.name, s.coeff, list(s.grades) + [g] * r)
+             for s, r, g in zip(subjects, remaining, fills)]
+    return calculate_final_average(trial) >= goal
+
+
+def _settle(grade, reaches):
+    """Raises a rounded grade by 0.01 until reaches(grade) holds. Returns None past MAX_GRADE."""
+    while grade is not None and not reaches(grade):
+        grade = round(grade + 0.01, 2)
+        if grade > MAX_GRADE: return None
+    return grade
+
+
+def _required(need, weight):
+    """Grade x with weight * x >= need. 0.0 when already reached, None when out of reach."""
+    if need <= 1e-12: return 0.0
+    if weight <= 0: return None
+    grade = _round_up(need / weight)
+    return grade if grade <= MAX_GRADE else None
+
+
+def _target_terms(subjects, remaining):
+    """Per subject: (fixed contribution a_j, weight b_j of the remaining exams, current average) and C."""
+    if len(remaining) != len(subjects): raise ValueError("One remaining exam count per subject is needed.")
+    terms = []
+    for s, r in zip(subjects, remaining):
+        n = len(s.grades)
+        total = n + r
+        known = sum(s.grades)
+        terms.append((s.coeff * known / total if total else 0.0, s.coeff * r / total if total else 0.0,
+                      known / n if n else 0.0))
+    return terms, sum(s.coeff for s in subjects)
+
+
+def required_grade(subjects, remaining, target, scale=None):
+    """
+    Minimum grade to score on every remaining exam to reach the target.
+    :param subjects: SubjectData list holding the grades known so far
+    :param remaining: Exams still to sit, one count per subject
+    :param target: Tier label or numeric average (see target_average)
+    :return: Grade rounded up to 0.01, 0.0 if the target is already secured
+             (even with 0 on every remaining exam), None if 20 everywhere is not enough
+    """
+    terms, total_c = _target_terms(subjects, remaining)
+    if total_c <= 0: return None
+    goal = target_average(target, scale)
+    grade = _required(goal * total_c - sum(a for a, _, _ in terms), sum(b for _, b, _ in terms))
+    return _settle(grade, lambda x: _reaches(subjects, remaining, [x] * len(subjects), goal))
+
+
+def required_grades_by_subject(subjects, remaining, target, assume=None, scale=None):
+    """
+    Minimum grade on the remaining exams of each subject, one subject at a time.
+    :param assume: Grade expected on the other subjects' remaining exams
+                   (default: each subject keeps its current average)
+    :return: List aligned with subjects: grade, 0.0 (secured) or None (out of reach, or no exam left)
+    """
+    terms, total_c = _target_terms(subjects, remaining)
+    if total_c <= 0: return [None] * len(subjects)
+    goal = target_average(target, scale)
+    need = goal * total_c - sum(a for a, _, _ in terms)
+    others = [current if assume is None else assume for _, _, current in terms]
+    expected = [b * g for (_, b, _), g in zip(terms, others)]
+    total_expected = sum(expected)
+    results = []
+    for j, ((_, b, _), own) in enumerate(zip(terms, expected)):
+        def reaches(x, j=j):
+            return _reaches(subjects, remaining, others[:j] + [x] + others[j + 1:], goal)
+
+        results.append(_settle(_required(need - (total_expected - own), b), reaches))
+    return results
+
+
+def required_grades_batch(grades, mask, remaining, coeffs, target, assume=None, scale=None):
+    """
+    Cohort version of required_grade and required_grades_by_subject, on calculate_batch arrays.
+    :param grades: Float array (students, subjects, exams) of known grades
+    :param mask: Bool array, same shape, True where a grade is known
+    :param remaining: Int array (students, subjects), or (subjects,) shared by all students
+    :param coeffs: Array (subjects,) or (students, subjects)
+    :return: (uniform (students,), by_subject (students, subjects)) with the same conventions,
+             NaN standing for None
+    """
+    import numpy as np
+
+    grades = np.asarray(grades, dtype=np.float64)
+    mask = np.asarray(mask, dtype=bool)
+    shape = grades.shape[:2]
+    coeffs = np.broadcast_to(np.asarray(coeffs, dtype=np.float64), shape)
+    remaining = np.broadcast_to(np.asarray(remaining, dtype=np.float64), shape)
+
+    # Every sum in the order the scalar solver uses, so both give the same candidates
+    counts = mask.sum(axis=2)
+    known = _sum_in_order(np.where(mask, grades, 0.0))
+    totals = counts + remaining
+    fixed = np.divide(coeffs * known, totals, out=np.zeros(shape), where=totals > 0)
+    weights = np.divide(coeffs * remaining, totals, out=np.zeros(shape), where=totals > 0)
+    total_c = coeffs.sum(axis=1)
+    goal = target_average(target, scale)
+    need = goal * total_c - _sum_in_order(fixed)
+
+    # Remaining exams as extra exam slots, to check candidates with calculate_batch itself
+    max_remaining = int(remaining.max()) if remaining.size else 0
+    extra_mask = np.arange(max_remaining) < remaining[..., None]
+    check_mask = np.concatenate([mask, extra_mask], axis=2)
+
+    def finish(need, weight):
+        grade = np.divide(need, weight, out=np.full(need.shape, np.inf), where=weight > 0)
+        grade = np.ceil(grade * 100 - 1e-9) / 100
+        grade = np.where(need <= 1e-12, 0.0, grade)
+        return np.where(grade <= MAX_GRADE, grade, np.nan)
+
+    def settle(grade, fills_for):
+        """Vector _settle: fills_for(grade) gives the (students, subjects) grade of the remaining exams."""
+        while True:
+            fills = np.broadcast_to(fills_for(np.nan_to_num(grade))[..., None], shape + (max_remaining,))
+            reached = calculate_batch(np.concatenate([grades, fills], axis=2), check_mask, coeffs)[2] >= goal
+            missed = ~np.isnan(grade) & ~reached
+            if not missed.any(): return grade
+            grade = np.where(missed, np.round(grade + 0.01, 2), grade)
+            grade = np.where(grade <= MAX_GRADE, grade, np.nan)
+
+    uniform = finish(need, _sum_in_order(weights))
+    uniform[total_c <= 0] = np.nan
+    uniform = settle(uniform, lambda x: np.broadcast_to(x[:, None], shape))
+
+    current = np.divide(known, counts, out=np.zeros(shape), where=counts > 0)
+    others = np.broadcast_to(current if assume is None else np.float64(assume), shape)
+    expected = weights * others
+    subject_need = need[:, None] - (_sum_in_order(expected)[:, None] - expected)
+    by_subject = finish(subject_need, weights)
+    by_subject[total_c <= 0] = np.nan
+    for j in range(shape[1]):
+        def fills_for(x, j=j):
+            fills = others.copy()
+            fills[:, j] = x
+            return fills
+
+        by_subject[:, j] = settle(by_subject[:, j], fills_for)
+    return uniform, by_subject
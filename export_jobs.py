@@ -0,0 +1,74 @@
+# export_jobs.py
+# ---------------------------------------------------------
+# BACKGROUND PDF EXPORTS
+# Runs report rendering off the UI event loop on a worker pool
+# shared by every session, with progress and cancellation.
+# No UI libraries (Flet) allowed here.
+# ---------------------------------------------------------
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Exports running at once across all sessions; later ones wait in the pool queue
+MAX_CONCURRENT_EXPORTS = 2
+
+_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_EXPORTS, thread_name_prefix="pdf-export")
+
+
+class ExportCancelled(Exception):
+    """Raised from a progress callback to abort a render in progress."""
+
+
+class ExportJob:
+    """
+    Progress and cancellation state of one export.
+    Pass job.on_progress to PDFReportGenerator.render(); it raises ExportCancelled once cancel() was called.
+    """
+
+    def __init__(self, expected_pages=1, on_update=None):
+        """
+        :param expected_pages: Page estimate used to turn page events into a fraction
+        :param on_update: Optional callback(fraction), called from the worker thread
+        """
+        self.expected_pages = max(1, expected_pages)
+        self.on_update = on_update
+        self.progress = 0.0
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def check(self):
+        """Raises ExportCancelled if the job was cancelled."""
+        if self._cancelled.is_set(): raise ExportCancelled("Export cancelled")
+
+    def on_progress(self, kind, value):
+        """ReportLab progress callback: tracks pages done and honours cancellation."""
+        self.check()
+        if kind == "PAGE":
+            self._set_progress(min(value / self.expected_pages, 0.95))
+        elif kind == "FINISHED":
+            self._set_progress(1.0)
+
+    def _set_progress(self, fraction):
+        self.progress = fraction
+        if self.on_update:
+            self.on_update(fraction)
+
+
+async def run_export(job, func, *args):
+    """
+    Runs func(*args) on the shared export pool without blocking the event loop.
+    Raises ExportCancelled if the job is cancelled before or while it runs.
+    """
+    def task():
+        job.check()  # Cancelled while waiting in the queue
+        return func(*args)
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, task)
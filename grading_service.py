@@ -0,0 +1,469 @@
+# grading_service.py
+# ---------------------------------------------------------
+# LOCAL HTTP GRADING / REPORT SERVICE
+# Exposes the grading core and PDF reports as JSON over HTTP for
+# other internal systems. Standard library only, no UI (Flet) here.
+#
+#   python grading_service.py --port 8765
+#   curl -X POST localhost:8765/compute -d '{"student": "a1", "subjects": [...]}'
+#   curl -X POST localhost:8765/report -d '{...}' -o report.pdf
+#   curl localhost:8765/metrics
+# ---------------------------------------------------------
+
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from bulk_reports import ReportJob, _init_worker, _render_job
+from core import build_subjects, calculate_batch, classify_batch, subjects_to_arrays
+from headless import StudentResult
+
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 1024 * 1024
+REQUEST_TIMEOUT = 30.0
+# Compute requests waiting for the batcher before new ones get a 429
+DEFAULT_MAX_QUEUE = 1024
+DEFAULT_MAX_BATCH = 64
+DEFAULT_BATCH_WINDOW = 0.005
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is unbounded
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class ServiceBusy(Exception):
+    """Raised when a queue is full; the client gets a 429 and should retry later."""
+
+
+# --- METRICS ---
+
+class LatencyHistogram:
+    """Request latencies bucketed by LATENCY_BUCKETS_MS (not cumulative)."""
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms):
+        i = 0
+        while i < len(LATENCY_BUCKETS_MS) and ms > LATENCY_BUCKETS_MS[i]:
+            i += 1
+        self.buckets[i] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms: self.max_ms = ms
+
+    def to_dict(self):
+        labels = [f"le_{b}" for b in LATENCY_BUCKETS_MS] + ["le_inf"]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "buckets": dict(zip(labels, self.buckets)),
+        }
+
+
+class ServiceMetrics:
+    """Thread-safe request counters and per-endpoint latency histograms."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency = {}  # endpoint -> LatencyHistogram
+        self.statuses = {}  # "200" -> count
+        self.rejected = 0
+        self.batches = 0
+        self.batched_students = 0
+        self.max_batch_seen = 0
+
+    def observe(self, endpoint, status, seconds):
+        with self._lock:
+            hist = self.latency.get(endpoint)
+            if hist is None:
+                hist = self.latency[endpoint] = LatencyHistogram()
+            hist.observe(seconds * 1000)
+            key = str(status)
+            self.statuses[key] = self.statuses.get(key, 0) + 1
+            if status == 429: self.rejected += 1
+
+    def observe_batch(self, size):
+        with self._lock:
+            self.batches += 1
+            self.batched_students += size
+            if size > self.max_batch_seen: self.max_batch_seen = size
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "requests": dict(sorted(self.statuses.items())),
+                "rejected": self.rejected,
+                "latency": {name: h.to_dict() for name, h in sorted(self.latency.items())},
+                "batches": {
+                    "count": self.batches,
+                    "students": self.batched_students,
+                    "mean_size": round(self.batched_students / self.batches, 2) if self.batches else 0.0,
+                    "max_size": self.max_batch_seen,
+                },
+            }
+
+
+# --- COMPUTE (micro-batched) ---
+
+class ComputeBatcher:
+    """
+    Collects compute requests for up to `window` seconds (or max_batch students)
+    and grades them together with the batch engine.
+    The queue is bounded: submit() raises ServiceBusy once max_queue students are waiting.
+    """
+
+    def __init__(self, max_queue=DEFAULT_MAX_QUEUE, max_batch=DEFAULT_MAX_BATCH, window=DEFAULT_BATCH_WINDOW,
+                 metrics=None):
+        self.max_batch = max_batch
+        self.window = window
+        self.metrics = metrics
+        self.max_queue = max_queue
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._submit_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="compute-batcher", daemon=True)
+        self._thread.start()
+
+    def depth(self):
+        return self._queue.qsize()
+
+    def submit(self, student_id, subjects):
+        """Queues one validated student. Returns a Future resolving to a StudentResult."""
+        return self.submit_many([(student_id, subjects)])[0]
+
+    def submit_many(self, students):
+        """
+        Queues validated (student_id, subjects) pairs all together or not at all.
+        :raises OverflowError: More students than the queue can ever hold (retrying cannot help)
+        :raises ServiceBusy: Not enough room right now
+        :return: One Future per student, resolving to a StudentResult
+        """
+        if len(students) > self.max_queue:
+            raise OverflowError(f"At most {self.max_queue} students per request.")
+        futures = [Future() for _ in students]
+        # Only submitters add to the queue, so room checked under this lock cannot shrink before the puts
+        with self._submit_lock:
+            if self.max_queue - self._queue.qsize() < len(students):
+                raise ServiceBusy("Compute queue is full.")
+            for (student_id, subjects), future in zip(students, futures):
+                self._queue.put_nowait((student_id, subjects, future))
+        return futures
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None: return
+            batch = [item]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0: break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._process(batch)
+                    return
+                batch.append(item)
+            self._process(batch)
+
+    def _process(self, batch):
+        if self.metrics: self.metrics.observe_batch(len(batch))
+        # The batch engine needs one subject count per array: grade each shape group together
+        groups = {}
+        for item in batch:
+            groups.setdefault(len(item[1]), []).append(item)
+        for items in groups.values():
+            try:
+                self._grade_group(items)
+            except Exception as e:
+                for _, _, future in items:
+                    if not future.done(): future.set_exception(e)
+
+    @staticmethod
+    def _grade_group(items):
+        cohort = [subjects for _, subjects, _ in items]
+        max_exams = max((len(s.grades) for subjects in cohort for s in subjects), default=1)
+        averages, weighted, final_averages = calculate_batch(*subjects_to_arrays(cohort, max(1, max_exams)))
+        _, labels, colors = classify_batch(final_averages)
+        for i, (student_id, subjects, future) in enumerate(items):
+            for j, s in enumerate(subjects):
+                s.average, s.weighted_score = float(averages[i, j]), float(weighted[i, j])
+            future.set_result(StudentResult(student_id, subjects, float(final_averages[i]), str(labels[i]),
+                                            str(colors[i])))
+
+
+# --- RENDER (process pool) ---
+
+class RenderPool:
+    """Process pool for PDF rendering that accepts at most max_pending renders at once."""
+
+    def __init__(self, workers=None, max_pending=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * 2
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+    def depth(self):
+        return self._in_flight
+
+    def submit(self, student_id, subjects):
+        """Queues one render. Returns a Future resolving to a bulk_reports.ReportResult with pdf_bytes."""
+        if not self._slots.acquire(blocking=False):
+            raise ServiceBusy("Render queue is full.")
+        with self._lock:
+            self._in_flight += 1
+        future = self._pool.submit(_render_job, ReportJob(0, student_id, subjects), None)
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, _future):
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def close(self):
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+# --- HTTP ---
+
+def parse_students(payload):
+    """
+    Accepts one student ({"student", "subjects"}), a list of them, or {"students": [...]}.
+    :return: List of (student_id, raw_subjects)
+    """
+    if isinstance(payload, dict):
+        payload = payload.get("students", [payload])
+    if not isinstance(payload, list):
+        raise ValueError("Expected a student object or a list of students.")
+    records = []
+    for i, rec in enumerate(payload):
+        if not isinstance(rec, dict): raise ValueError(f"Student #{i} must be an object.")
+        records.append((rec.get("student", i), rec.get("subjects", [])))
+    return records
+
+
+def validate_subjects(raw_subjects):
+    """Same validation as the UI and the headless runner. Raises ValueError."""
+    try:
+        return build_subjects(raw_subjects)
+    except (AttributeError, TypeError) as e:
+        raise ValueError(f"Invalid subject: {e}")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "AcademicPro/1.0"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def log_message(self, fmt, *args):
+        if self.service.verbose:
+            super().log_message(fmt, *args)
+
+    # --- Responses ---
+
+    def _send(self, status, body, content_type="application/json", headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        return status
+
+    def _send_json(self, status, data, headers=None):
+        return self._send(status, json.dumps(data).encode("utf-8"), headers=headers)
+
+    def _read_json(self):
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            # The body cannot be delimited: answer, then drop the connection instead of reading to EOF
+            self.close_connection = True
+            raise ValueError("Invalid Content-Length.")
+        if length > MAX_BODY_BYTES: raise OverflowError(f"Request body over {MAX_BODY_BYTES} bytes.")
+        try:
+            return json.loads(self.rfile.read(length) or b"null")
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ValueError(f"Invalid JSON: {e}")
+
+    # --- Dispatch ---
+
+    def do_GET(self):
+        self._dispatch({"/metrics": self._get_metrics, "/health": self._get_health})
+
+    def do_POST(self):
+        self._dispatch({"/compute": self._post_compute, "/report": self._post_report})
+
+    def _dispatch(self, routes):
+        start = time.perf_counter()
+        path = self.path.split("?", 1)[0]
+        route = routes.get(path)
+        try:
+            if route is None:
+                status = self._send_json(404, {"error": f"Unknown endpoint: {self.command} {path}"})
+            else:
+                status = route()
+        except ServiceBusy as e:
+            status = self._send_json(429, {"error": str(e)}, {"Retry-After": "1"})
+        except OverflowError as e:
+            status = self._send_json(413, {"error": str(e)}, {"Connection": "close"})
+            self.close_connection = True
+        except ValueError as e:
+            status = self._send_json(400, {"error": str(e)})
+        except FutureTimeout:
+            status = self._send_json(504, {"error": "Timed out."})
+        except Exception as e:
+            status = self._send_json(500, {"error": str(e)})
+        self.service.metrics.observe(path if route else "other", status, time.perf_counter() - start)
+
+    # --- Endpoints ---
+
+    def _get_health(self):
+        return self._send_json(200, {"status": "ok"})
+
+    def _get_metrics(self):
+        return self._send_json(200, self.service.metrics_snapshot())
+
+    def _post_compute(self):
+        """
+        Grades one or many students. In a list, invalid students carry their error like the headless runner;
+        a single student object that fails validation is a 400.
+        """
+        payload = self._read_json()
+        single = isinstance(payload, dict) and "students" not in payload
+        records = parse_students(payload)
+        results = [None] * len(records)
+        valid = []
+        for i, (student_id, raw_subjects) in enumerate(records):
+            try:
+                valid.append((i, student_id, validate_subjects(raw_subjects)))
+            except ValueError as e:
+                if single: raise
+                results[i] = StudentResult(student_id, error=str(e))
+
+        futures = self.service.batcher.submit_many([(student_id, subjects) for _, student_id, subjects in valid])
+        deadline = time.monotonic() + REQUEST_TIMEOUT
+        for (i, _, _), future in zip(valid, futures):
+            results[i] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+
+        data = [r.to_dict() for r in results]
+        return self._send_json(200, data[0] if single else data)
+
+    def _post_report(self):
+        """Renders one student's PDF report in the process pool."""
+        records = parse_students(self._read_json())
+        if len(records) != 1: raise ValueError("Exactly one student per report.")
+        student_id, raw_subjects = records[0]
+        subjects = validate_subjects(raw_subjects)
+        result = self.service.renderer.submit(student_id, subjects).result(timeout=REQUEST_TIMEOUT)
+        if not result.success:
+            return self._send_json(500, {"error": result.message})
+        return self._send(200, result.pdf_bytes, "application/pdf", {
+            "Content-Disposition": f'attachment; filename="{result.name}"',
+            "X-Average": f"{result.average:.4f}",
+            "X-Classification": result.classification,
+        })
+
+
+class GradingService:
+    """
+    The HTTP server plus its compute batcher and render pool.
+    Use port=0 to bind a free port (see .url), e.g. in tests on localhost.
+    """
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, workers=None, max_renders=None,
+                 max_queue=DEFAULT_MAX_QUEUE, max_batch=DEFAULT_MAX_BATCH, batch_window=DEFAULT_BATCH_WINDOW,
+                 verbose=False):
+        self.verbose = verbose
+        self.metrics = ServiceMetrics()
+        self.batcher = ComputeBatcher(max_queue, max_batch, batch_window, self.metrics)
+        self.renderer = RenderPool(workers, max_renders)
+        self.server = ThreadingHTTPServer((host, port), _Handler)
+        self.server.daemon_threads = True
+        self.server.service = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def metrics_snapshot(self):
+        data = self.metrics.snapshot()
+        data["queue"] = {
+            "compute_depth": self.batcher.depth(),
+            "render_in_flight": self.renderer.depth(),
+            "render_capacity": self.renderer.max_pending,
+        }
+        return data
+
+    def start(self):
+        """Serves in a background thread and returns immediately."""
+        self._thread = threading.Thread(target=self.server.serve_forever, name="grading-service", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self.server.serve_forever()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread:
+            self._thread.join()
+        self.batcher.close()
+        self.renderer.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve grading and PDF reports over local HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("-p", "--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Render processes (default: CPU count)")
+    parser.add_argument("--max-renders", type=int, default=None,
+                        help="Renders queued or running before 429 (default: 2 per worker)")
+    parser.add_argument("--max-queue", type=int, default=DEFAULT_MAX_QUEUE,
+                        help="Students waiting for compute before 429")
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH, help="Students per compute batch")
+    parser.add_argument("--batch-window-ms", type=float, default=DEFAULT_BATCH_WINDOW * 1000,
+                        help="How long a compute batch waits to fill up")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args(argv)
+
+    service = GradingService(args.host, args.port, args.workers, args.max_renders, args.max_queue,
+                             args.max_batch, args.batch_window_ms / 1000, args.verbose)
+    print(f"Serving on {service.url} (POST /compute, POST /report, GET /metrics)", flush=True)
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
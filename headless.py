@@ -0,0 +1,188 @@
+# headless.py
+# ---------------------------------------------------------
+# HEADLESS GRADING ENTRY POINT
+# Runs the grading pipeline without the UI, for server-side batch jobs.
+# Never import flet here (ReportLab is only loaded for PDF output).
+# ---------------------------------------------------------
+
+import argparse
+import csv
+import json
+import os
+import sys
+
+from core import build_subjects, calculate_final_average, get_classification
+from instrumentation import timed
+from result_cache import ResultCache
+
+CSV_COLUMNS = ["student", "subject", "coeff", "grades"]
+
+
+class StudentResult:
+    """Graded student: validated subjects, final average and classification (or the validation error)."""
+
+    def __init__(self, student_id, subjects=None, average=None, classification=None, color=None, error=None):
+        self.student_id = str(student_id)
+        self.subjects = subjects or []
+        self.average = average
+        self.classification = classification
+        self.color = color
+        self.error = error
+
+    def to_dict(self):
+        return {
+            "student": self.student_id,
+            "average": self.average,
+            "classification": self.classification,
+            "error": self.error,
+            "subjects": [
+                {"name": s.name, "coeff": s.coeff, "grades": s.grades,
+                 "average": s.average, "weighted_score": s.weighted_score}
+                for s in self.subjects
+            ],
+        }
+
+
+# --- INPUT ---
+
+def read_cohort(filepath, fmt=None):
+    """
+    Reads raw cohort data.
+    CSV: one row per subject with columns student, subject, coeff, grades ("12;15.5;9").
+    JSON: [{"student": "id", "subjects": [{"name": "Math", "coeff": 4, "grades": [12, 15]}]}, ...]
+    :param fmt: "csv" or "json" (default: from the file extension)
+    :return: List of (student_id, [{"name", "coeff", "grades"}, ...])
+    """
+    fmt = fmt or os.path.splitext(filepath)[1].lstrip(".").lower()
+    with open(filepath, "r", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            return _read_csv(f)
+        if fmt == "json":
+            return _read_json(f)
+    raise ValueError(f"Unsupported input format: '{fmt}' (use csv or json)")
+
+
+def _read_csv(f):
+    students = {}
+    for row in csv.DictReader(f):
+        raw = (row.get("grades") or "").strip()
+        students.setdefault(row["student"], []).append({
+            "name": row.get("subject"),
+            "coeff": row.get("coeff") or 1,
+            "grades": [g.strip() for g in raw.split(";")] if raw else [],
+        })
+    return list(students.items())
+
+
+def _read_json(f):
+    records = json.load(f)
+    if isinstance(records, dict):
+        records = records.get("students", [records])
+    # A record that is not an object keeps its slot and fails validation as a student
+    return [(rec.get("student", i), rec.get("subjects", [])) if isinstance(rec, dict) else (i, None)
+            for i, rec in enumerate(records)]
+
+
+# --- PROCESSING ---
+
+def grade_student(student_id, raw_subjects, cache=None):
+    """
+    Validates and grades one student. Validation errors are kept on the result, not raised.
+    :param cache: Optional ResultCache; unchanged inputs reuse the cached averages
+    """
+    try:
+        with timed("validation"):
+            subjects = build_subjects(raw_subjects)
+    except ValueError as err:
+        return StudentResult(student_id, error=str(err))
+
+    if cache is not None:
+        with timed("calculation"):
+            final_avg, text, color_hex = cache.results(subjects)
+        return StudentResult(student_id, subjects, final_avg, text, color_hex)
+
+    with timed("calculation"):
+        final_avg = calculate_final_average(subjects)
+    with timed("classification"):
+        text, color_hex = get_classification(final_avg)
+    return StudentResult(student_id, subjects, final_avg, text, color_hex)
+
+
+def grade_cohort(records, cache=None):
+    """Grades every (student_id, raw_subjects) record."""
+    return [grade_student(student_id, raw_subjects, cache) for student_id, raw_subjects in records]
+
+
+# --- OUTPUT ---
+
+def write_csv(results, stream):
+    writer = csv.writer(stream)
+    writer.writerow(["student", "average", "classification", "error"])
+    for r in results:
+        writer.writerow([r.student_id, "" if r.average is None else f"{r.average:.2f}",
+                         r.classification or "", r.error or ""])
+
+
+def write_json(results, stream):
+    json.dump([r.to_dict() for r in results], stream, indent=2)
+
+
+def write_pdf(results, out_dir, workers=None, cache_dir=None):
+    """Renders one PDF per valid student into out_dir. Returns the bulk manifest."""
+    from bulk_reports import ReportJob, run_batch  # ReportLab is only needed here
+
+    jobs = (ReportJob(i, r.student_id, r.subjects) for i, r in enumerate(results) if r.error is None)
+    return run_batch(jobs, out_dir, workers, cache_dir=cache_dir)
+
+
+def write_cohort_pdf(results, target):
+    """Renders every valid student into one combined PDF with a class summary up front."""
+    from pdf_service import PDFReportGenerator  # ReportLab is only needed here
+
+    students = [(r.student_id, r.subjects) for r in results if r.error is None]
+    return PDFReportGenerator().generate_cohort(students, target)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Grade a cohort without the UI.")
+    parser.add_argument("input", help="Cohort CSV or JSON file")
+    parser.add_argument("-i", "--input-format", choices=["csv", "json"], default=None)
+    parser.add_argument("-f", "--format", choices=["csv", "json", "pdf", "cohort"], default="json",
+                        help="Output format (cohort: one combined PDF for the whole class)")
+    parser.add_argument("-o", "--output", default="-", help="Output file ('-' for stdout), or directory for pdf")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes for pdf output")
+    parser.add_argument("-c", "--cache-dir", default=None,
+                        help="Disk cache so reruns skip unchanged results and pdf reports")
+    args = parser.parse_args(argv)
+
+    # Repeated inputs (and, with --cache-dir, students graded by an earlier run) reuse their results
+    cache = ResultCache(disk_dir=args.cache_dir)
+    results = grade_cohort(read_cohort(args.input, args.input_format), cache)
+    failed = sum(1 for r in results if r.error)
+
+    if args.format == "pdf":
+        out_dir = "reports" if args.output == "-" else args.output
+        manifest = write_pdf(results, out_dir, args.workers, args.cache_dir)
+        failed += manifest["failed"]
+    elif args.format == "cohort":
+        target = "cohort_report.pdf" if args.output == "-" else args.output
+        success, msg = write_cohort_pdf(results, target)
+        if not success:
+            print(f"Cohort report failed: {msg}", file=sys.stderr)
+            failed += 1
+    else:
+        writer = write_csv if args.format == "csv" else write_json
+        if args.output == "-":
+            writer(results, sys.stdout)
+        else:
+            with open(args.output, "w", encoding="utf-8", newline="") as f:
+                writer(results, f)
+
+    for r in results:
+        if r.error:
+            print(f"{r.student_id}: {r.error}", file=sys.stderr)
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
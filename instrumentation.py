@@ -0,0 +1,180 @@
+# instrumentation.py
+# ---------------------------------------------------------
+# OPT-IN TIMING INSTRUMENTATION
+# Records timings and counts for the grading / report pipeline.
+# Disabled by default: timed() then returns a shared no-op context.
+#
+#   ACADEMIC_PRO_INSTRUMENT=1 python headless.py cohort.csv   # collect + print summary
+#   python instrumentation.py --cprofile main.py              # any entry point under cProfile
+# ---------------------------------------------------------
+
+import argparse
+import atexit
+import os
+import runpy
+import sys
+import threading
+import time
+
+_enabled = os.environ.get("ACADEMIC_PRO_INSTRUMENT", "") not in ("", "0")
+_lock = threading.Lock()
+_timings = {}  # name -> [count, total seconds, max seconds]
+_counters = {}  # name -> count
+_hooks = []
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+class _Timer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.start)
+
+
+class _NoOp:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return None
+
+
+_NOOP = _NoOp()
+
+
+def timed(name):
+    """Context manager timing the block under `name` (no-op while disabled)."""
+    return _Timer(name) if _enabled else _NOOP
+
+
+def record(name, seconds):
+    """Adds one timing sample and forwards it to the hooks."""
+    if not _enabled: return
+    with _lock:
+        entry = _timings.get(name)
+        if entry is None:
+            _timings[name] = [1, seconds, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+            if seconds > entry[2]: entry[2] = seconds
+    for hook in list(_hooks):
+        hook(name, seconds)
+
+
+def count(name, n=1):
+    """Increments a counter (no-op while disabled)."""
+    if not _enabled: return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def add_hook(callback):
+    """Registers callback(name, seconds), called for every timing sample."""
+    _hooks.append(callback)
+
+
+def remove_hook(callback):
+    if callback in _hooks: _hooks.remove(callback)
+
+
+def reset():
+    with _lock:
+        _timings.clear()
+        _counters.clear()
+
+
+def summary():
+    """
+    Returns {"timings": {name: {count, total_ms, mean_ms, max_ms}}, "counters": {name: count}}
+    """
+    with _lock:
+        timings = {
+            name: {
+                "count": n,
+                "total_ms": round(total * 1000, 3),
+                "mean_ms": round(total / n * 1000, 4),
+                "max_ms": round(peak * 1000, 3),
+            }
+            for name, (n, total, peak) in sorted(_timings.items())
+        }
+        return {"timings": timings, "counters": dict(sorted(_counters.items()))}
+
+
+def dump_summary(stream=None):
+    """Prints the summary as a table (default: stderr)."""
+    stream = stream or sys.stderr
+    data = summary()
+    print(f"{'PHASE':<28}{'COUNT':>9}{'TOTAL ms':>13}{'MEAN ms':>12}{'MAX ms':>11}", file=stream)
+    for name, t in data["timings"].items():
+        print(f"{name:<28}{t['count']:>9}{t['total_ms']:>13.3f}{t['mean_ms']:>12.4f}{t['max_ms']:>11.3f}",
+              file=stream)
+    for name, n in data["counters"].items():
+        print(f"{name:<28}{n:>9}", file=stream)
+
+
+if _enabled:
+    atexit.register(dump_summary)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run any entry point with instrumentation on, optionally under cProfile.")
+    parser.add_argument("--cprofile", action="store_true", help="Run under cProfile and print the top functions")
+    parser.add_argument("--cprofile-out", default=None, metavar="FILE", help="Save cProfile stats to FILE instead")
+    parser.add_argument("--sort", default="cumulative", help="pstats sort key for printed stats")
+    parser.add_argument("script", help="Entry point, e.g. main.py, headless.py, bulk_reports.py")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="Arguments for the entry point")
+    args = parser.parse_args(argv)
+
+    # Entry points import "instrumentation", not this __main__ copy: switch that module on
+    import instrumentation
+    instrumentation.enable()
+    sys.argv = [args.script] + args.args
+    sys.path.insert(0, os.path.dirname(os.path.abspath(args.script)))
+
+    profiler = None
+    if args.cprofile or args.cprofile_out:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        runpy.run_path(args.script, run_name="__main__")
+    except SystemExit:
+        pass
+    finally:
+        if profiler:
+            profiler.disable()
+            if args.cprofile_out:
+                profiler.dump_stats(args.cprofile_out)
+            else:
+                import pstats
+                pstats.Stats(profiler, stream=sys.stderr).sort_stats(args.sort).print_stats(30)
+        instrumentation.dump_summary()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,20 @@
+import time
+_IMPORT_START = time.perf_counter()
+
 import flet as ft
 import datetime
 import os
-from core import SubjectData, get_classification
-from pdf_service import PDFReportGenerator
+import uuid
+from core import (DEFAULT_SCALE, RunningTotals, SubjectInput, get_classification, required_grade,
+                  required_grades_by_subject)
+from export_jobs import ExportCancelled, ExportJob, run_export
+from instrumentation import count, record, timed
+from result_cache import get_cache
+from session_store import get_store
+from update_scheduler import UpdateScheduler
+
+# ReportLab (pdf_service) is imported on the first export, not here: it is the slowest import of the app
+record("startup.imports", time.perf_counter() - _IMPORT_START)
 
 # --- 🎨 THEME CONSTANTS ---
 COLOR_BG = "#0f0f12"
@@ -12,6 +24,16 @@ COLOR_ACCENT = "#a29bfe"
 COLOR_SUCCESS = "#00b894"
 COLOR_ERROR = "#d63031"
 
+# Subject cards are built in chunks as the input list scrolls
+CARD_CHUNK_SIZE = 10
+MAX_SUBJECTS = 50
+
+# Control changes within this window are pushed in one update
+UPDATE_WINDOW = 0.05
+
+# Client storage entry holding the device's session store key
+SESSION_KEY_NAME = "academic_pro.session_key"
+
 
 def get_transparent_color(color_hex, opacity):
     """
@@ -26,8 +48,41 @@ def get_transparent_color(color_hex, opacity):
     return color_hex
 
 
+def create_report_file(directory="."):
+    """
+    Claims a timestamped report name that never overwrites an earlier export and returns
+    the open binary file. The name is taken with an exclusive create, so concurrent exports
+    in the same second each get their own _2, _3... suffix.
+    """
+    stamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+    filename = f"Report_{stamp}.pdf"
+    n = 1
+    while True:
+        try:
+            return open(os.path.join(directory, filename), "xb")
+        except FileExistsError:
+            n += 1
+            filename = f"Report_{stamp}_{n}.pdf"
+
+
+def get_session_key(page):
+    """
+    Stable store key for this device: kept in client storage, so saved results are found again
+    after a reconnect or restart. Falls back to the per-connection session id if storage is unavailable.
+    """
+    try:
+        key = page.client_storage.get(SESSION_KEY_NAME)
+        if not key:
+            key = uuid.uuid4().hex
+            page.client_storage.set(SESSION_KEY_NAME, key)
+        return key
+    except Exception:
+        return page.session_id
+
+
 def main(page: ft.Page):
     print("Page is loading...")  # DEBUG PRINT
+    started = time.perf_counter()
 
     # --- 📱 PAGE CONFIGURATION ---
     page.title = "Academic Pro"
@@ -41,23 +96,49 @@ def main(page: ft.Page):
     page.window.resizable = True
 
     # --- STATE ---
-    ui_cards = []
+    subject_inputs = []  # SubjectInput per subject (the source of truth for entered values)
+    ui_cards = []  # Cards built so far, in subject order
+    pdf_generator = None  # Built on the first export
+    store = get_store()  # Shared by every session of the process
+    session_key = get_session_key(page)
+    cache = get_cache()  # Rendered PDFs by input hash, also shared
+    export_job = None  # ExportJob running for this session
+    totals = RunningTotals()
+    dirty_indices = set()
+    input_errors = {}  # subject index -> validation message
+    result_rows = {}  # subject index -> ResultRow
+    updates = UpdateScheduler(page, UPDATE_WINDOW)
+    views = {}  # route -> ft.View, each built on first navigation
+
+    # Controls of the lazily built views (None until their view exists)
+    slider_setup_count = None
+    lv_inputs = lbl_live_avg = None
+    lbl_final_score = lbl_class_text = cont_class_badge = lv_results_breakdown = None
+    bar_export_progress = btn_cancel_export = btn_export = None
+    dd_target = slider_remaining = lbl_what_if = None
+
+    def update_controls(*controls):
+        """Queues only the given controls; changes within UPDATE_WINDOW go out in one update."""
+        updates.schedule(*controls)
 
     # --- COMPONENT: SUBJECT CARD WRAPPER ---
     class SubjectCardWrapper:
-        def __init__(self, index):
-            self.index = index
+        def __init__(self, model):
+            self.model = model
+            self.index = index = model.index
             self.txt_name = ft.TextField(
                 label=f"Subject {index}",
+                value=model.name,
                 border_color=COLOR_PRIMARY,
                 text_size=16,
                 border_radius=10,
-                cursor_color=COLOR_ACCENT
+                cursor_color=COLOR_ACCENT,
+                on_change=self.on_name_change
             )
             # FIXED: ft.Colors (Capital C)
-            self.txt_coeff_display = ft.Text("Coeff: 1", color=ft.Colors.GREY)
+            self.txt_coeff_display = ft.Text(f"Coeff: {model.coeff}", color=ft.Colors.GREY)
             self.slider_coeff = ft.Slider(
-                min=1, max=10, divisions=9, value=1,
+                min=1, max=10, divisions=9, value=model.coeff,
                 active_color=COLOR_PRIMARY,
                 on_change=lambda e: self.update_coeff_label(e.control.value)
             )
@@ -65,7 +146,7 @@ def main(page: ft.Page):
 
             # ControlState is correct for Flet 0.26.0+
             self.exams_segment = ft.SegmentedButton(
-                selected={"1"},
+                selected={str(len(model.grades))},
                 allow_multiple_selection=False,
                 on_change=self.on_exam_count_change,
                 segments=[
@@ -81,7 +162,7 @@ def main(page: ft.Page):
                 )
             )
             self.grade_inputs = []
-            self.add_grade_input(1)
+            for i in range(1, len(model.grades) + 1): self.add_grade_input(i)
 
             self.ui = ft.Container(
                 bgcolor=COLOR_SURFACE, border_radius=15, padding=20,
@@ -105,207 +186,416 @@ def main(page: ft.Page):
             )
 
         def update_coeff_label(self, value):
+            self.model.coeff = int(value)
             self.txt_coeff_display.value = f"Coeff: {int(value)}"
-            page.update()
+            update_controls(self.txt_coeff_display)
+            self.mark_dirty()
+
+        def on_name_change(self, e):
+            self.model.name = e.control.value
+            self.mark_dirty()
+
+        def on_grade_change(self, slot, value):
+            self.model.grades[slot] = value
+            self.mark_dirty()
+
+        def mark_dirty(self, e=None):
+            dirty_indices.add(self.index)
+            refresh_results()
 
         def add_grade_input(self, exam_num):
             border_col = get_transparent_color(COLOR_PRIMARY, 0.5)
 
             inp = ft.TextField(
                 label=f"Exam {exam_num} (/20)",
+                value=self.model.grades[exam_num - 1],
                 border_color=border_col,
                 keyboard_type=ft.KeyboardType.NUMBER,
                 height=50,
                 border_radius=10,
                 text_size=14,
-                cursor_color=COLOR_ACCENT
+                cursor_color=COLOR_ACCENT,
+                on_change=lambda e, slot=exam_num - 1: self.on_grade_change(slot, e.control.value)
             )
             self.grades_column.controls.append(inp)
             self.grade_inputs.append(inp)
 
         def on_exam_count_change(self, e):
             if not e.control.selected: return
-            count = int(list(e.control.selected)[0])
+            exam_count = int(list(e.control.selected)[0])
+            self.model.set_exam_count(exam_count)
             self.grades_column.controls.clear()
             self.grade_inputs.clear()
-            for i in range(1, count + 1): self.add_grade_input(i)
-            page.update()
+            for i in range(1, exam_count + 1): self.add_grade_input(i)
+            update_controls(self.grades_column)
+            self.mark_dirty()
 
         def extract_data(self):
-            name = self.txt_name.value.strip()
-            if not name: raise ValueError(f"Subject #{self.index} name is missing.")
-            raw_grades = []
-            for inp in self.grade_inputs:
-                try:
-                    if not inp.value: raise ValueError
-                    val = float(inp.value)
-                    if not (0 <= val <= 20): raise ValueError
-                    raw_grades.append(val)
-                except ValueError:
-                    raise ValueError(f"Invalid grade in '{name}' (Must be 0-20)")
-            return SubjectData(self.index, name, int(self.slider_coeff.value), raw_grades)
+            return self.model.to_subject()
+
+    # --- COMPONENT: RESULT ROW ---
+    class ResultRow:
+        """One line of the subject breakdown, patched in place when its subject changes."""
+
+        def __init__(self):
+            # FIXED: ft.Colors (Capital C)
+            self.txt_name = ft.Text("", weight="bold", size=16, color=ft.Colors.WHITE, expand=True)
+            self.txt_avg = ft.Text("", color=COLOR_ACCENT, weight="bold", size=16, text_align="right")
+            self.txt_coeff = ft.Text("", color=ft.Colors.GREY, size=12, text_align="right")
+            self.txt_need = ft.Text("", color=COLOR_SUCCESS, size=12, text_align="right")
+            self.ui = ft.Container(
+                bgcolor=COLOR_SURFACE, padding=15, border_radius=10, visible=False,
+                content=ft.Row([
+                    self.txt_name,
+                    ft.Column([self.txt_avg, self.txt_coeff, self.txt_need], alignment=ft.MainAxisAlignment.END)
+                ])
+            )
+
+        def patch(self, s):
+            """Shows the calculated SubjectData, or hides the row while its inputs are invalid."""
+            self.ui.visible = s is not None
+            if s is None: return
+            self.txt_name.value = s.name
+            self.txt_avg.value = f"{s.average:.2f}"
+            self.txt_coeff.value = f"x{s.coeff}"
+
+        def show_need(self, grade):
+            """Shows the what-if grade needed in this subject alone."""
+            self.txt_need.value = "out of reach" if grade is None else "secured" if grade == 0 else f"need {grade:.2f}"
+
+    # --- INCREMENTAL RESULTS ---
+    def patch_result_row(index, data):
+        """Updates one breakdown row. Returns the controls that need pushing."""
+        if lv_results_breakdown is None: return []  # Synced when the results view is built
+        row = result_rows.get(index)
+        if row is None:
+            row = ResultRow()
+            result_rows[index] = row
+            position = sum(1 for i in result_rows if i < index)
+            lv_results_breakdown.controls.insert(position, row.ui)
+            row.patch(data)
+            return [lv_results_breakdown]
+        row.patch(data)
+        return [row.ui]
+
+    def patch_final_badge():
+        """Updates the final average displays from the running totals."""
+        final_avg = totals.final_average
+        with timed("classification"):
+            text, color_hex = get_classification(final_avg)
+        changed = []
+        if lbl_live_avg is not None:
+            lbl_live_avg.value = f"Live average: {final_avg:.2f} ({text})"
+            changed.append(lbl_live_avg)
+        if lbl_final_score is not None:
+            lbl_final_score.value = f"{final_avg:.2f}"
+            lbl_class_text.value = text.upper()
+            cont_class_badge.bgcolor = color_hex
+            changed.extend([lbl_final_score, lbl_class_text, cont_class_badge])
+        return changed
+
+    def patch_what_if():
+        """Solves the target-grade what-if for the current subjects. Returns the controls that need pushing."""
+        if lbl_what_if is None: return []
+        subjects = totals.ordered()
+        remaining = [int(slider_remaining.value)] * len(subjects)
+        target = dd_target.value
+        with timed("what_if"):
+            uniform = required_grade(subjects, remaining, target)
+            by_subject = required_grades_by_subject(subjects, remaining, target)
+        if uniform is None:
+            lbl_what_if.value = f"{target} is out of reach, even with 20/20 on every remaining exam."
+        elif uniform == 0:
+            lbl_what_if.value = f"{target} is secured, whatever the remaining exams."
+        else:
+            lbl_what_if.value = f"{target}: {uniform:.2f} / 20 needed on every remaining exam."
+        changed = [lbl_what_if]
+        for s, grade in zip(subjects, by_subject):
+            row = result_rows.get(s.index)
+            if row is None: continue
+            row.show_need(grade)
+            changed.append(row.txt_need)
+        return changed
+
+    def on_what_if_change(e):
+        update_controls(*patch_what_if())
+
+    def refresh_results():
+        """Recalculates only the dirty subjects, then patches their rows and the badge."""
+        if not dirty_indices: return
+        changed = []
+        for index in sorted(dirty_indices):
+            try:
+                with timed("validation"):
+                    data = subject_inputs[index - 1].to_subject()
+                input_errors.pop(index, None)
+            except ValueError as err:
+                data = None
+                input_errors[index] = str(err)
+            with timed("calculation"):
+                totals.update(index, data)
+            with timed("results_view"):
+                changed.extend(patch_result_row(index, data))
+        count("results_view.rows_patched", len(dirty_indices))
+        dirty_indices.clear()
+        changed.extend(patch_final_badge())
+        changed.extend(patch_what_if())
+        update_controls(*changed)
+
+    # --- LAZY CARDS ---
+    def load_more_cards():
+        """Builds the next chunk of subject cards. Returns True if any were added."""
+        start = len(ui_cards)
+        for model in subject_inputs[start:start + CARD_CHUNK_SIZE]:
+            card = SubjectCardWrapper(model)
+            ui_cards.append(card)
+            lv_inputs.controls.append(card.ui)
+        return len(ui_cards) > start
+
+    def on_inputs_scroll(e):
+        # Near the bottom: build the next chunk before the user gets there
+        if e.pixels >= e.max_scroll_extent - 300 and load_more_cards():
+            update_controls(lv_inputs)
 
     # --- APP ACTIONS ---
     def go_input(e):
         try:
-            count = int(slider_setup_count.value)
+            n_subjects = int(slider_setup_count.value)
+            get_view("/input")
             lv_inputs.controls.clear()
+            if lv_results_breakdown is not None: lv_results_breakdown.controls.clear()
+            subject_inputs.clear()
             ui_cards.clear()
-            for i in range(1, count + 1):
-                card = SubjectCardWrapper(i)
-                ui_cards.append(card)
-                lv_inputs.controls.append(card.ui)
+            result_rows.clear()
+            input_errors.clear()
+            totals.clear()
+            for i in range(1, n_subjects + 1):
+                subject_inputs.append(SubjectInput(i))
+                dirty_indices.add(i)
+            refresh_results()
+            load_more_cards()
             page.go("/input")
         except Exception as ex:
             print(f"Error: {ex}")
 
     def calculate_results(e):
         try:
-            processed_subjects = []
-            for wrapper in ui_cards:
-                data = wrapper.extract_data()
-                data.calculate()
-                processed_subjects.append(data)
-
-            total_w = sum(s.weighted_score for s in processed_subjects)
-            total_c = sum(s.coeff for s in processed_subjects)
-            final_avg = total_w / total_c if total_c > 0 else 0
-            text, color_hex = get_classification(final_avg)
+            refresh_results()
+            if input_errors: raise ValueError(input_errors[min(input_errors)])
+            final_avg = totals.final_average
+            text, _ = get_classification(final_avg)
 
-            lbl_final_score.value = f"{final_avg:.2f}"
-            lbl_class_text.value = text.upper()
-            cont_class_badge.bgcolor = color_hex
-
-            lv_results_breakdown.controls.clear()
-            for s in processed_subjects:
-                lv_results_breakdown.controls.append(
-                    ft.Container(
-                        bgcolor=COLOR_SURFACE, padding=15, border_radius=10,
-                        content=ft.Row([
-                            # FIXED: ft.Colors (Capital C)
-                            ft.Text(s.name, weight="bold", size=16, color=ft.Colors.WHITE, expand=True),
-                            ft.Column([
-                                ft.Text(f"{s.average:.2f}", color=COLOR_ACCENT, weight="bold", size=16,
-                                        text_align="right"),
-                                # FIXED: ft.Colors (Capital C)
-                                ft.Text(f"x{s.coeff}", color=ft.Colors.GREY, size=12, text_align="right")
-                            ], alignment=ft.MainAxisAlignment.END)
-                        ])
-                    )
-                )
-
-            page.session.set("subjects", processed_subjects)
-            page.session.set("avg", final_avg)
-            page.session.set("class", text)
+            store.save(session_key, totals.ordered(), final_avg, text)
 
             page.show_snack_bar(ft.SnackBar(content=ft.Text("Results Calculated!"), bgcolor=COLOR_SUCCESS))
             page.go("/results")
         except ValueError as err:
             page.show_snack_bar(ft.SnackBar(ft.Text(str(err)), bgcolor=COLOR_ERROR))
 
-    def export_pdf(e):
+    def get_pdf_generator():
+        """Imports ReportLab and builds the generator on first use (runs on the export pool)."""
+        nonlocal pdf_generator
+        if pdf_generator is None:
+            with timed("startup.pdf_import"):
+                from pdf_service import PDFReportGenerator
+                pdf_generator = PDFReportGenerator()
+        return pdf_generator
+
+    def save_report(job, saved):
+        """Runs on the export pool: render (or reuse) the PDF bytes and write them to a new report file."""
+        generator = get_pdf_generator()
+        # Unchanged inputs reuse the bytes rendered by the previous export
+        pdf_bytes = cache.pdf(saved.subjects, saved.average, saved.classification,
+                              lambda s, avg, cls: generator.render_bytes(s, avg, cls, job.on_progress))
+        job.check()
+        with create_report_file() as f:
+            f.write(pdf_bytes)
+        return os.path.basename(f.name)
+
+    def set_export_progress(fraction):
+        bar_export_progress.value = fraction
+        update_controls(bar_export_progress)
+
+    def show_export_controls(running):
+        bar_export_progress.value = 0
+        bar_export_progress.visible = running
+        btn_cancel_export.visible = running
+        btn_export.disabled = running
+        update_controls(bar_export_progress, btn_cancel_export, btn_export)
+
+    def cancel_export(e):
+        if export_job: export_job.cancel()
+
+    async def export_pdf(e):
+        nonlocal export_job
+        if export_job: return
         try:
-            filename = f"Report_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-            gen = PDFReportGenerator()
-            success, msg = gen.generate(
-                page.session.get("subjects"),
-                page.session.get("avg"),
-                page.session.get("class"),
-                filename
-            )
-            if success:
-                page.show_snack_bar(ft.SnackBar(ft.Text(f"Saved: {filename}"), bgcolor=COLOR_SUCCESS))
-            else:
-                page.show_snack_bar(ft.SnackBar(ft.Text(f"Error: {msg}"), bgcolor=COLOR_ERROR))
+            saved = store.load(session_key)
+            if saved is None: raise ValueError("Calculate results before exporting.")
+            export_job = ExportJob(on_update=set_export_progress)
+            show_export_controls(True)
+            # The first export pays the ReportLab import, off the event loop
+            generator = await run_export(export_job, get_pdf_generator)
+            export_job.expected_pages = generator.estimate_pages(len(saved.subjects))
+            filename = await run_export(export_job, save_report, export_job, saved)
+            page.show_snack_bar(ft.SnackBar(ft.Text(f"Saved: {filename}"), bgcolor=COLOR_SUCCESS))
+        except ExportCancelled:
+            page.show_snack_bar(ft.SnackBar(ft.Text("Export cancelled."), bgcolor=COLOR_ERROR))
         except Exception as ex:
             page.show_snack_bar(ft.SnackBar(ft.Text(str(ex)), bgcolor=COLOR_ERROR))
+        finally:
+            export_job = None
+            show_export_controls(False)
+
+    # --- VIEWS (each built on first navigation) ---
+    def build_welcome_view():
+        nonlocal slider_setup_count
+        slider_setup_count = ft.Slider(min=1, max=MAX_SUBJECTS, divisions=MAX_SUBJECTS - 1, value=5,
+                                       label="{value}", active_color=COLOR_PRIMARY)
+
+        return ft.View("/", [
+            ft.Container(
+                padding=30, alignment=ft.alignment.center, expand=True,
+                content=ft.Column([
+                    ft.Icon(ft.Icons.SCHOOL, size=80, color=COLOR_PRIMARY),
+                    ft.Text("Academic Pro", size=32, weight="bold"),
+                    # FIXED: ft.Colors (Capital C)
+                    ft.Text("Mobile Edition", color=ft.Colors.GREY),
+                    ft.Divider(height=40, color=ft.Colors.TRANSPARENT),
+                    ft.Text("How many subjects?", size=16),
+                    slider_setup_count,
+                    # FIXED: ft.Colors (Capital C)
+                    ft.ElevatedButton("Start Session", on_click=go_input, bgcolor=COLOR_PRIMARY,
+                                      color=ft.Colors.WHITE, height=50, width=200),
+                    ft.Divider(height=50, color=ft.Colors.TRANSPARENT),
+                    ft.Text("Powered by Karim Dev", size=12, color=ft.Colors.GREY)
+                ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, alignment=ft.MainAxisAlignment.CENTER)
+            )
+        ], bgcolor=COLOR_BG, padding=0)
 
-    # --- VIEWS ---
-    slider_setup_count = ft.Slider(min=1, max=10, divisions=9, value=5, label="{value}", active_color=COLOR_PRIMARY)
-
-    view_welcome = ft.View("/", [
-        ft.Container(
-            padding=30, alignment=ft.alignment.center, expand=True,
-            content=ft.Column([
-                ft.Icon(ft.Icons.SCHOOL, size=80, color=COLOR_PRIMARY),
-                ft.Text("Academic Pro", size=32, weight="bold"),
-                # FIXED: ft.Colors (Capital C)
-                ft.Text("Mobile Edition", color=ft.Colors.GREY),
-                ft.Divider(height=40, color=ft.Colors.TRANSPARENT),
-                ft.Text("How many subjects?", size=16),
-                slider_setup_count,
-                # FIXED: ft.Colors (Capital C)
-                ft.ElevatedButton("Start Session", on_click=go_input, bgcolor=COLOR_PRIMARY, color=ft.Colors.WHITE,
-                                  height=50, width=200),
-                ft.Divider(height=50, color=ft.Colors.TRANSPARENT),
-                ft.Text("Powered by Karim Dev", size=12, color=ft.Colors.GREY)
-            ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, alignment=ft.MainAxisAlignment.CENTER)
-        )
-    ], bgcolor=COLOR_BG, padding=0)
-
-    lv_inputs = ft.ListView(expand=True, spacing=15, padding=20)
-
-    view_input = ft.View("/input", [
-        # FIXED: ft.Colors (Capital C)
-        ft.AppBar(title=ft.Text("Subject Details"), bgcolor=COLOR_SURFACE, color=ft.Colors.WHITE),
-        lv_inputs,
-        ft.Container(
-            padding=20, bgcolor=COLOR_SURFACE,
+    def build_input_view():
+        nonlocal lv_inputs, lbl_live_avg
+        lv_inputs = ft.ListView(expand=True, spacing=15, padding=20, on_scroll=on_inputs_scroll,
+                                on_scroll_interval=100)
+        lbl_live_avg = ft.Text("Live average: 0.00", color=COLOR_ACCENT, size=12)
+
+        view = ft.View("/input", [
             # FIXED: ft.Colors (Capital C)
-            content=ft.ElevatedButton("CALCULATE RESULTS", on_click=calculate_results, bgcolor=COLOR_SUCCESS,
+            ft.AppBar(title=ft.Text("Subject Details"), bgcolor=COLOR_SURFACE, color=ft.Colors.WHITE),
+            lv_inputs,
+            ft.Container(
+                padding=20, bgcolor=COLOR_SURFACE,
+                content=ft.Column([
+                    lbl_live_avg,
+                    # FIXED: ft.Colors (Capital C)
+                    ft.ElevatedButton("CALCULATE RESULTS", on_click=calculate_results, bgcolor=COLOR_SUCCESS,
                                       color=ft.Colors.WHITE, height=50, width=400)
-        )
-    ], bgcolor=COLOR_BG, padding=0)
-
-    lbl_final_score = ft.Text("0.00", size=60, weight="bold")
-    # FIXED: ft.Colors (Capital C)
-    lbl_class_text = ft.Text("STATUS", color=ft.Colors.BLACK, weight="bold")
-    cont_class_badge = ft.Container(padding=10, border_radius=20, content=lbl_class_text)
-    lv_results_breakdown = ft.ListView(expand=True, spacing=10, padding=20)
-
-    view_results = ft.View("/results", [
+                ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=10)
+            )
+        ], bgcolor=COLOR_BG, padding=0)
+        patch_final_badge()
+        return view
+
+    def build_results_view():
+        nonlocal lbl_final_score, lbl_class_text, cont_class_badge, lv_results_breakdown
+        nonlocal bar_export_progress, btn_cancel_export, btn_export
+        nonlocal dd_target, slider_remaining, lbl_what_if
+        lbl_final_score = ft.Text("0.00", size=60, weight="bold")
+        # FIXED: ft.Colors (Capital C)
+        lbl_class_text = ft.Text("STATUS", color=ft.Colors.BLACK, weight="bold")
+        cont_class_badge = ft.Container(padding=10, border_radius=20, content=lbl_class_text)
+        lv_results_breakdown = ft.ListView(expand=True, spacing=10, padding=20)
+        bar_export_progress = ft.ProgressBar(value=0, visible=False, color=COLOR_ACCENT, width=400)
+        btn_cancel_export = ft.TextButton("CANCEL EXPORT", visible=False, on_click=cancel_export)
         # FIXED: ft.Colors (Capital C)
-        ft.AppBar(title=ft.Text("Performance Report"), bgcolor=COLOR_SURFACE,
-                  leading=ft.IconButton(ft.Icons.ARROW_BACK, on_click=lambda _: page.go("/")),
-                  color=ft.Colors.WHITE),
-        ft.Container(
-            padding=20, alignment=ft.alignment.center,
-            content=ft.Column([
-                ft.Container(
-                    bgcolor=get_transparent_color(COLOR_PRIMARY, 0.1),
-                    border=ft.border.all(1, COLOR_PRIMARY),
-                    border_radius=30,
-                    padding=30,
-                    alignment=ft.alignment.center,
-                    content=ft.Column([
-                        ft.Text("FINAL AVERAGE", color=COLOR_ACCENT, size=12),
-                        lbl_final_score,
-                        # FIXED: ft.Colors (Capital C)
-                        ft.Text("/ 20", color=ft.Colors.GREY),
-                        ft.Divider(height=10, color=ft.Colors.TRANSPARENT),
-                        cont_class_badge
-                    ], horizontal_alignment=ft.CrossAxisAlignment.CENTER)
-                ),
-                # FIXED: ft.Colors (Capital C)
-                ft.Divider(height=20, color=ft.Colors.TRANSPARENT),
-                ft.Text("Subject Breakdown", size=18, weight="bold")
-            ])
-        ),
-        lv_results_breakdown,
-        ft.Container(
-            padding=20, bgcolor=COLOR_SURFACE,
+        btn_export = ft.ElevatedButton("EXPORT PDF", icon=ft.Icons.PICTURE_AS_PDF, on_click=export_pdf,
+                                       bgcolor=COLOR_PRIMARY, color=ft.Colors.WHITE, height=50, width=400)
+
+        # What-if: grade needed on the remaining exams to reach a tier (defaults to the next one up)
+        next_tier = min(DEFAULT_SCALE.tier_index(totals.final_average) + 1, len(DEFAULT_SCALE.labels) - 1)
+        dd_target = ft.Dropdown(label="Target", value=DEFAULT_SCALE.labels[next_tier], width=170,
+                                options=[ft.dropdown.Option(label) for label in DEFAULT_SCALE.labels[1:]],
+                                on_change=on_what_if_change)
+        slider_remaining = ft.Slider(min=1, max=4, divisions=3, value=1, label="{value}",
+                                     active_color=COLOR_PRIMARY, on_change=on_what_if_change)
+        lbl_what_if = ft.Text("", color=COLOR_ACCENT, size=12)
+
+        view = ft.View("/results", [
             # FIXED: ft.Colors (Capital C)
-            content=ft.ElevatedButton("EXPORT PDF", icon=ft.Icons.PICTURE_AS_PDF, on_click=export_pdf,
-                                      bgcolor=COLOR_PRIMARY, color=ft.Colors.WHITE, height=50, width=400)
-        )
-    ], bgcolor=COLOR_BG, padding=0)
+            ft.AppBar(title=ft.Text("Performance Report"), bgcolor=COLOR_SURFACE,
+                      leading=ft.IconButton(ft.Icons.ARROW_BACK, on_click=lambda _: page.go("/")),
+                      color=ft.Colors.WHITE),
+            ft.Container(
+                padding=20, alignment=ft.alignment.center,
+                content=ft.Column([
+                    ft.Container(
+                        bgcolor=get_transparent_color(COLOR_PRIMARY, 0.1),
+                        border=ft.border.all(1, COLOR_PRIMARY),
+                        border_radius=30,
+                        padding=30,
+                        alignment=ft.alignment.center,
+                        content=ft.Column([
+                            ft.Text("FINAL AVERAGE", color=COLOR_ACCENT, size=12),
+                            lbl_final_score,
+                            # FIXED: ft.Colors (Capital C)
+                            ft.Text("/ 20", color=ft.Colors.GREY),
+                            ft.Divider(height=10, color=ft.Colors.TRANSPARENT),
+                            cont_class_badge
+                        ], horizontal_alignment=ft.CrossAxisAlignment.CENTER)
+                    ),
+                    ft.Container(
+                        bgcolor=COLOR_SURFACE, border_radius=15, padding=15,
+                        content=ft.Column([
+                            ft.Text("WHAT DO I NEED?", color=COLOR_ACCENT, size=12),
+                            ft.Row([dd_target, ft.Column([ft.Text("Remaining exams per subject", size=12),
+                                                          slider_remaining], expand=True)]),
+                            lbl_what_if,
+                            ft.Text("Per subject: that subject alone, the others keeping their average.", size=11,
+                                    color=ft.Colors.GREY)
+                        ], spacing=5)
+                    ),
+                    # FIXED: ft.Colors (Capital C)
+                    ft.Divider(height=20, color=ft.Colors.TRANSPARENT),
+                    ft.Text("Subject Breakdown", size=18, weight="bold")
+                ])
+            ),
+            lv_results_breakdown,
+            ft.Container(
+                padding=20, bgcolor=COLOR_SURFACE,
+                content=ft.Column([bar_export_progress, btn_export, btn_cancel_export],
+                                  horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=10)
+            )
+        ], bgcolor=COLOR_BG, padding=0)
+
+        # Catch up with everything calculated before the view existed
+        for index in range(1, len(subject_inputs) + 1):
+            patch_result_row(index, totals.subjects.get(index))
+        patch_final_badge()
+        patch_what_if()
+        return view
+
+    view_builders = {"/": build_welcome_view, "/input": build_input_view, "/results": build_results_view}
+
+    def get_view(route):
+        view = views.get(route)
+        if view is None:
+            with timed("startup.build_view"):
+                view = views[route] = view_builders[route]()
+        return view
 
     def route_change(route):
+        nonlocal started
         page.views.clear()
-        page.views.append(view_welcome)
-        if page.route == "/input": page.views.append(view_input)
-        if page.route == "/results": page.views.append(view_results)
+        page.views.append(get_view("/"))
+        if page.route == "/input": page.views.append(get_view("/input"))
+        if page.route == "/results": page.views.append(get_view("/results"))
         page.update()
+        if started is not None:
+            # First frame pushed: from main() and from the start of the imports
+            now = time.perf_counter()
+            record("startup.first_render", now - started)
+            record("startup.total", now - _IMPORT_START)
+            started = None
 
     def view_pop(view):
         page.views.pop()
@@ -314,6 +604,7 @@ def main(page: ft.Page):
 
     page.on_route_change = route_change
     page.on_view_pop = view_pop
+    page.on_disconnect = lambda _: store.evict(session_key)
     page.go("/")
     print("App Loaded!")
 
@@ -0,0 +1,215 @@
+# result_cache.py
+# ---------------------------------------------------------
+# CONTENT-ADDRESSED RESULT CACHE
+# Reuses averages, classification and rendered PDF bytes when the
+# subject inputs (names, coeffs, grades) have not changed.
+# Memory tier: bounded LRU. Optional disk tier for batch reruns.
+# ---------------------------------------------------------
+
+import datetime
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from core import calculate_final_average, get_classification
+
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_PDF_BYTES = 64 * 1024 * 1024
+
+
+def subjects_key(subjects):
+    """Hash of the normalized inputs: subject order, names, coefficients and grades."""
+    normalized = [[s.name.strip(), int(s.coeff), [float(g) for g in s.grades]] for s in subjects]
+    payload = json.dumps(normalized, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def pdf_key(subjects, variant=""):
+    """PDF cache key. Includes today's date, which is printed in the report header."""
+    stamp = datetime.date.today().isoformat()
+    return hashlib.sha256(f"{subjects_key(subjects)}|{stamp}|{variant}".encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Two LRU tiers keyed by input hash: calculated results and rendered PDF bytes.
+    With disk_dir set, results and PDFs are also kept as <key>.json and <key>.pdf files,
+    so a rerun after a crash skips every student that was already processed.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_pdf_bytes=DEFAULT_MAX_PDF_BYTES, disk_dir=None):
+        self.max_entries = max_entries
+        self.max_pdf_bytes = max_pdf_bytes
+        self.disk_dir = disk_dir
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+        self._results = OrderedDict()  # key -> (averages, weighted_scores, final_avg, text, color)
+        self._pdfs = OrderedDict()  # key -> bytes
+        self._pdf_bytes = 0
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.pdf_hits = 0
+        self.pdf_disk_hits = 0
+        self.pdf_misses = 0
+        self.evictions = 0
+
+    # --- RESULTS ---
+
+    def results(self, subjects):
+        """
+        Calculates the subjects (in place) and returns (final_avg, classification, color),
+        reusing the cached numbers when the inputs were seen before.
+        """
+        key = subjects_key(subjects)
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None:
+                self._results.move_to_end(key)
+                self.hits += 1
+        if cached is None:
+            cached = self._read_results(key)
+        if cached is not None:
+            averages, weighted, final_avg, text, color = cached
+            for s, avg, w in zip(subjects, averages, weighted):
+                s.average, s.weighted_score = avg, w
+            return final_avg, text, color
+
+        final_avg = calculate_final_average(subjects)
+        text, color = get_classification(final_avg)
+        entry = ([s.average for s in subjects], [s.weighted_score for s in subjects], final_avg, text, color)
+        path = self._disk_path(key, ".json")
+        if path:
+            self._write_disk(path, json.dumps(entry).encode("utf-8"))
+        with self._lock:
+            self.misses += 1
+        self._remember_results(key, entry)
+        return final_avg, text, color
+
+    def _read_results(self, key):
+        path = self._disk_path(key, ".json")
+        if not path or not os.path.exists(path): return None
+        with open(path, "rb") as f:
+            entry = tuple(json.loads(f.read()))
+        with self._lock:
+            self.disk_hits += 1
+        self._remember_results(key, entry)
+        return entry
+
+    def _remember_results(self, key, entry):
+        with self._lock:
+            self._results[key] = entry
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+                self.evictions += 1
+
+    # --- PDF BYTES ---
+
+    def pdf(self, subjects, total_avg, classification, render, variant=""):
+        """
+        Returns the PDF bytes for these inputs, calling render(subjects, total_avg, classification)
+        only on a miss in both tiers.
+        """
+        key = pdf_key(subjects, variant)
+        data = self.get_pdf(key)
+        if data is None:
+            data = render(subjects, total_avg, classification)
+            self.put_pdf(key, data)
+        return data
+
+    def get_pdf(self, key):
+        with self._lock:
+            data = self._pdfs.get(key)
+            if data is not None:
+                self._pdfs.move_to_end(key)
+                self.pdf_hits += 1
+                return data
+        path = self._disk_path(key)
+        if path and os.path.exists(path):
+            with open(path, "rb") as f:
+                data = f.read()
+            self._remember_pdf(key, data)
+            with self._lock:
+                self.pdf_disk_hits += 1
+            return data
+        with self._lock:
+            self.pdf_misses += 1
+        return None
+
+    def put_pdf(self, key, data):
+        path = self._disk_path(key)
+        if path:
+            self._write_disk(path, data)
+        self._remember_pdf(key, data)
+
+    def has_pdf(self, key):
+        with self._lock:
+            if key in self._pdfs: return True
+        path = self._disk_path(key)
+        return bool(path) and os.path.exists(path)
+
+    def _remember_pdf(self, key, data):
+        if len(data) > self.max_pdf_bytes: return
+        with self._lock:
+            old = self._pdfs.pop(key, None)
+            if old is not None: self._pdf_bytes -= len(old)
+            self._pdfs[key] = data
+            self._pdf_bytes += len(data)
+            while len(self._pdfs) > self.max_entries or self._pdf_bytes > self.max_pdf_bytes:
+                _, evicted = self._pdfs.popitem(last=False)
+                self._pdf_bytes -= len(evicted)
+                self.evictions += 1
+
+    def _disk_path(self, key, suffix=".pdf"):
+        return os.path.join(self.disk_dir, f"{key}{suffix}") if self.disk_dir else None
+
+    @staticmethod
+    def _write_disk(path, data):
+        # Write then rename: a crash never leaves a truncated entry behind
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    # --- MAINTENANCE ---
+
+    def clear(self):
+        """Empties the memory tiers (disk files are kept)."""
+        with self._lock:
+            self._results.clear()
+            self._pdfs.clear()
+            self._pdf_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "pdf_hits": self.pdf_hits,
+                "pdf_disk_hits": self.pdf_disk_hits,
+                "pdf_misses": self.pdf_misses,
+                "evictions": self.evictions,
+                "results_cached": len(self._results),
+                "pdfs_cached": len(self._pdfs),
+                "pdf_bytes": self._pdf_bytes,
+            }
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_cache():
+    """The process-wide memory-only cache shared by every Flet session."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ResultCache()
+        return _shared_cache
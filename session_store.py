@@ -0,0 +1,202 @@
+# session_store.py
+# ---------------------------------------------------------
+# PERSISTENT SESSION STORE
+# Saves calculated sessions to a local SQLite file in a compact
+# binary form, with a bounded LRU cache in front.
+# One store is shared by every session of the process.
+# ---------------------------------------------------------
+
+import os
+import struct
+import sqlite3
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict
+
+from core import SlottedSubjectData
+
+DEFAULT_DB_NAME = "academic_pro.db"
+DEFAULT_CACHE_SIZE = 256
+# Past results kept per key; older ones are deleted on save
+DEFAULT_MAX_HISTORY = 20
+# Sessions not saved for this long are deleted (with their history) when the shared store opens
+DEFAULT_MAX_AGE = 90 * 24 * 3600
+
+# Per subject: name length (bytes), coefficient, exam count
+_SUBJECT_HEADER = struct.Struct("<HHB")
+
+
+# --- COMPACT SERIALIZATION ---
+
+def pack_subjects(subjects):
+    """Encodes SubjectData objects as bytes: header + UTF-8 name + float64 grades per subject."""
+    parts = []
+    for s in subjects:
+        name = s.name.encode("utf-8")
+        grades = array("d", s.grades)
+        if sys.byteorder == "big": grades.byteswap()
+        parts.append(_SUBJECT_HEADER.pack(len(name), int(s.coeff), len(grades)))
+        parts.append(name)
+        parts.append(grades.tobytes())
+    return b"".join(parts)
+
+
+def unpack_subjects(blob):
+    """Decodes pack_subjects() output back into calculated (slotted) SubjectData objects."""
+    subjects = []
+    view = memoryview(blob)
+    pos = 0
+    index = 1
+    while pos < len(view):
+        name_len, coeff, n_grades = _SUBJECT_HEADER.unpack_from(view, pos)
+        pos += _SUBJECT_HEADER.size
+        name = bytes(view[pos:pos + name_len]).decode("utf-8")
+        pos += name_len
+        grades = array("d")
+        grades.frombytes(view[pos:pos + n_grades * 8])
+        if sys.byteorder == "big": grades.byteswap()
+        pos += n_grades * 8
+        sub = SlottedSubjectData(index, name, coeff, grades.tolist())
+        sub.calculate()
+        subjects.append(sub)
+        index += 1
+    return subjects
+
+
+class SessionRecord:
+    """One saved calculation: subjects, final average and classification."""
+
+    __slots__ = ("key", "subjects", "average", "classification", "saved_at")
+
+    def __init__(self, key, subjects, average, classification, saved_at=None):
+        self.key = key
+        self.subjects = subjects
+        self.average = average
+        self.classification = classification
+        self.saved_at = saved_at if saved_at is not None else time.time()
+
+
+# --- STORE ---
+
+class SessionStore:
+    """
+    SQLite-backed store for current sessions and their result history.
+    Reads go through an LRU cache of at most cache_size records, so memory stays flat
+    however many sessions the process serves. On disk, history is capped at max_history rows per key
+    and prune() drops keys that went quiet.
+    """
+
+    def __init__(self, path=DEFAULT_DB_NAME, cache_size=DEFAULT_CACHE_SIZE, max_history=DEFAULT_MAX_HISTORY):
+        self.path = path
+        self.cache_size = cache_size
+        self.max_history = max_history
+        self._cache = OrderedDict()  # key -> SessionRecord
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "key TEXT PRIMARY KEY, saved_at REAL, average REAL, classification TEXT, subjects BLOB)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS history ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, key TEXT, saved_at REAL, average REAL, "
+                "classification TEXT, subjects BLOB)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS history_key ON history (key, saved_at)")
+
+    def save(self, key, subjects, average, classification, keep_history=True):
+        """Stores the session under key (replacing it) and appends it to the key's history."""
+        record = SessionRecord(key, list(subjects), average, classification)
+        row = (key, record.saved_at, average, classification, pack_subjects(record.subjects))
+        with self._lock:
+            with self._conn:
+                self._conn.execute("INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?)", row)
+                if keep_history:
+                    self._conn.execute(
+                        "INSERT INTO history (key, saved_at, average, classification, subjects) "
+                        "VALUES (?, ?, ?, ?, ?)", row)
+                    self._conn.execute(
+                        "DELETE FROM history WHERE key = ? AND id NOT IN ("
+                        "SELECT id FROM history WHERE key = ? ORDER BY saved_at DESC, id DESC LIMIT ?)",
+                        (key, key, self.max_history))
+            self._remember(record)
+        return record
+
+    def load(self, key):
+        """Returns the SessionRecord for key, or None."""
+        with self._lock:
+            record = self._cache.get(key)
+            if record is not None:
+                self._cache.move_to_end(key)
+                return record
+            row = self._conn.execute(
+                "SELECT saved_at, average, classification, subjects FROM sessions WHERE key = ?",
+                (key,)).fetchone()
+            if row is None:
+                return None
+            record = SessionRecord(key, unpack_subjects(row[3]), row[1], row[2], row[0])
+            self._remember(record)
+            return record
+
+    def history(self, key, limit=20):
+        """Past results for key, newest first (not cached)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT saved_at, average, classification, subjects FROM history "
+                "WHERE key = ? ORDER BY saved_at DESC, id DESC LIMIT ?", (key, limit)).fetchall()
+        return [SessionRecord(key, unpack_subjects(r[3]), r[1], r[2], r[0]) for r in rows]
+
+    def delete(self, key, history=False):
+        with self._lock:
+            self._cache.pop(key, None)
+            with self._conn:
+                self._conn.execute("DELETE FROM sessions WHERE key = ?", (key,))
+                if history:
+                    self._conn.execute("DELETE FROM history WHERE key = ?", (key,))
+
+    def prune(self, max_age=DEFAULT_MAX_AGE):
+        """Deletes sessions (and history) not saved for max_age seconds. Returns the number of sessions removed."""
+        cutoff = time.time() - max_age
+        with self._lock:
+            with self._conn:
+                stale = [r[0] for r in self._conn.execute("SELECT key FROM sessions WHERE saved_at < ?", (cutoff,))]
+                self._conn.execute("DELETE FROM sessions WHERE saved_at < ?", (cutoff,))
+                self._conn.execute("DELETE FROM history WHERE saved_at < ?", (cutoff,))
+            for key in stale:
+                self._cache.pop(key, None)
+        return len(stale)
+
+    def evict(self, key):
+        """Drops key from the memory cache only (e.g. when its web session disconnects)."""
+        with self._lock:
+            self._cache.pop(key, None)
+
+    def close(self):
+        with self._lock:
+            self._cache.clear()
+            self._conn.close()
+
+    def _remember(self, record):
+        self._cache[record.key] = record
+        self._cache.move_to_end(record.key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+
+_shared_store = None
+_shared_lock = threading.Lock()
+
+
+def get_store():
+    """
+    The process-wide store shared by every Flet session.
+    Lives in FLET_APP_STORAGE_DATA when packaged, else the working directory.
+    """
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            folder = os.getenv("FLET_APP_STORAGE_DATA", ".")
+            _shared_store = SessionStore(os.path.join(folder, DEFAULT_DB_NAME))
+            _shared_store.prune()
+        return _shared_store
@@ -0,0 +1,162 @@
+# stream_pipeline.py
+# ---------------------------------------------------------
+# STREAMING INGESTION PIPELINE
+# Generator-based grading for grade exports larger than RAM.
+# Only one student's rows are held in memory at a time.
+# ---------------------------------------------------------
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+
+from core import build_subject, calculate_final_average, get_classification
+from headless import StudentResult
+
+
+# --- READERS (one raw subject row at a time) ---
+
+class UnreadableRecord(dict):
+    """{"error", "raw"} yielded in place of a record the reader could not use; grade_rows rejects it."""
+
+def iter_csv_rows(stream):
+    """
+    Yields (line_no, student_id, raw_subject) from a CSV stream
+    with columns student, subject, coeff, grades ("12;15.5;9").
+    """
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, row.get("student"), {
+            "name": row.get("subject"),
+            "coeff": row.get("coeff") or 1,
+            "grades": row.get("grades") or "",
+        }
+
+
+def iter_jsonl_rows(stream):
+    """
+    Yields (line_no, student_id, raw_subject) from a JSON Lines stream.
+    Each line is either one subject {"student", "subject", "coeff", "grades"}
+    or one student {"student", "subjects": [...]}.
+    Lines that are not a JSON object are yielded with student_id=None and an UnreadableRecord,
+    students whose "subjects" is not a list with their id and an UnreadableRecord.
+    """
+    for line_no, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            rec = json.loads(line)
+            if not isinstance(rec, dict): raise ValueError("expected an object")
+        except ValueError as err:
+            yield line_no, None, UnreadableRecord(error=f"Invalid JSON: {err}", raw=line.rstrip("\n"))
+            continue
+        if "subjects" in rec:
+            if not isinstance(rec["subjects"], list):
+                yield line_no, rec.get("student"), UnreadableRecord(error="'subjects' must be a list.",
+                                                                     raw=line.rstrip("\n"))
+                continue
+            for sub in rec["subjects"]:
+                yield line_no, rec.get("student"), sub
+        else:
+            yield line_no, rec.get("student"), {
+                "name": rec.get("subject", rec.get("name")),
+                "coeff": rec.get("coeff", 1),
+                "grades": rec.get("grades", []),
+            }
+
+
+def iter_rows(stream, fmt):
+    if fmt == "csv":
+        return iter_csv_rows(stream)
+    if fmt in ("jsonl", "ndjson"):
+        return iter_jsonl_rows(stream)
+    raise ValueError(f"Unsupported input format: '{fmt}' (use csv or jsonl)")
+
+
+# --- PIPELINE ---
+
+def _parse_grades(raw):
+    """A CSV cell ("12;15.5") or JSON value as a grade list. Blank or missing is [], which validation rejects."""
+    if isinstance(raw, str):
+        raw = raw.strip()
+        return [g.strip() for g in raw.split(";")] if raw else []
+    return [] if raw is None else raw
+
+
+def grade_rows(rows, on_reject=None):
+    """
+    Groups consecutive rows by student and yields one StudentResult per valid student.
+    Rows must be grouped by student (as exports are); memory stays bounded by one student.
+    :param rows: Iterable of (line_no, student_id, raw_subject)
+    :param on_reject: Callback(dict) receiving {"line", "student", "record", "error"} for every
+                      invalid row. A student with any rejected row yields no result.
+    """
+    for student_id, group in itertools.groupby(rows, key=lambda r: r[1]):
+        subjects = []
+        valid = True
+        for index, (line_no, _, raw) in enumerate(group, start=1):
+            try:
+                if isinstance(raw, UnreadableRecord): raise ValueError(raw["error"])
+                if student_id is None: raise ValueError("Student id is missing.")
+                subjects.append(build_subject(index, raw.get("name"), raw.get("coeff", 1),
+                                              _parse_grades(raw.get("grades"))))
+            except (AttributeError, TypeError, ValueError) as err:
+                valid = False
+                if on_reject:
+                    on_reject({"line": line_no, "student": student_id, "record": raw, "error": str(err)})
+        if not valid or not subjects:
+            continue
+
+        final_avg = calculate_final_average(subjects)
+        text, color_hex = get_classification(final_avg)
+        yield StudentResult(student_id, subjects, final_avg, text, color_hex)
+
+
+def run_pipeline(in_stream, out_stream, reject_stream=None, fmt="csv"):
+    """
+    Streams in_stream through validation and grading, writing one JSON line per student
+    to out_stream and one JSON line per rejected row to reject_stream.
+    :return: (students written, rows rejected)
+    """
+    rejected = 0
+
+    def on_reject(entry):
+        nonlocal rejected
+        rejected += 1
+        if reject_stream:
+            reject_stream.write(json.dumps(entry) + "\n")
+
+    written = 0
+    for result in grade_rows(iter_rows(in_stream, fmt), on_reject):
+        out_stream.write(json.dumps(result.to_dict()) + "\n")
+        written += 1
+    return written, rejected
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream-grade a large CSV / JSON Lines export.")
+    parser.add_argument("input", help="Input file ('-' for stdin), rows grouped by student")
+    parser.add_argument("-i", "--input-format", choices=["csv", "jsonl"], default=None)
+    parser.add_argument("-o", "--output", default="-", help="Results as JSON Lines ('-' for stdout)")
+    parser.add_argument("-r", "--rejects", default=None, help="Rejected rows as JSON Lines")
+    args = parser.parse_args(argv)
+
+    fmt = args.input_format or os.path.splitext(args.input)[1].lstrip(".").lower() or "csv"
+    in_stream = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8", newline="")
+    out_stream = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    reject_stream = open(args.rejects, "w", encoding="utf-8") if args.rejects else None
+    try:
+        written, rejected = run_pipeline(in_stream, out_stream, reject_stream, fmt)
+    finally:
+        for s in (in_stream, out_stream, reject_stream):
+            if s not in (None, sys.stdin, sys.stdout):
+                s.close()
+
+    print(f"Done: {written} students graded, {rejected} rows rejected", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
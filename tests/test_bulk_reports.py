@@ -0,0 +1,61 @@
+# test_bulk_reports.py
+# ---------------------------------------------------------
+# Bulk PDF generation: file names, manifest and failed students.
+# ---------------------------------------------------------
+
+import io
+import json
+import zipfile
+
+from bulk_reports import load_students, report_filename, run_batch, write_zip
+
+COHORT = [
+    {"student": "Ana María", "subjects": [{"name": "Math", "coeff": 4, "grades": [12, 15]}]},
+    {"student": "bad", "subjects": [{"name": "Math", "coeff": 4, "grades": [25]}]},
+    {"student": "../x", "subjects": [{"name": "Art", "coeff": 1, "grades": [18]}]},
+]
+
+
+def write_cohort(tmp_path):
+    path = tmp_path / "cohort.json"
+    path.write_text(json.dumps(COHORT), encoding="utf-8")
+    return str(path)
+
+
+def test_report_filename_is_deterministic_and_safe():
+    assert report_filename(7, "Ana María") == "Report_00007_Ana_Mar_a.pdf"
+    assert report_filename(2, "../x") == "Report_00002_x.pdf"
+    assert report_filename(3, "...") == "Report_00003_student.pdf"
+    # Same sanitized id, different index: never the same file
+    assert report_filename(0, "a/b") != report_filename(1, "a b")
+
+
+def test_run_batch_reports_failures_without_aborting(tmp_path):
+    out_dir = tmp_path / "reports"
+    manifest = run_batch(load_students(write_cohort(tmp_path)), str(out_dir), workers=1)
+
+    assert (manifest["total"], manifest["succeeded"], manifest["failed"]) == (3, 2, 1)
+    reports = manifest["reports"]
+    assert [r["name"] for r in reports] == \
+           ["Report_00000_Ana_Mar_a.pdf", "Report_00001_bad.pdf", "Report_00002_x.pdf"]
+    assert [r["success"] for r in reports] == [True, False, True]
+    assert "Must be 0-20" in reports[1]["message"] and reports[1]["path"] is None
+    assert reports[0]["average"] == 13.5 and reports[2]["classification"] == "Elite Mind"
+
+    assert sorted(p.name for p in out_dir.iterdir()) == \
+           ["Report_00000_Ana_Mar_a.pdf", "Report_00002_x.pdf", "manifest.json"]
+    assert (out_dir / "Report_00000_Ana_Mar_a.pdf").read_bytes().startswith(b"%PDF")
+    assert json.loads((out_dir / "manifest.json").read_text(encoding="utf-8"))["failed"] == 1
+
+
+def test_write_zip_streams_reports_and_manifest(tmp_path):
+    buffer = io.BytesIO()
+    manifest = write_zip(load_students(write_cohort(tmp_path)), buffer, workers=1)
+
+    assert (manifest["succeeded"], manifest["failed"]) == (2, 1)
+    with zipfile.ZipFile(buffer) as zf:
+        assert sorted(zf.namelist()) == ["Report_00000_Ana_Mar_a.pdf", "Report_00002_x.pdf", "manifest.json"]
+        assert zf.read("Report_00002_x.pdf").startswith(b"%PDF")
+        stored = json.loads(zf.read("manifest.json"))
+    assert [r["path"] for r in stored["reports"]] == ["Report_00000_Ana_Mar_a.pdf", None, "Report_00002_x.pdf"]
+    assert list(tmp_path.iterdir()) == [tmp_path / "cohort.json"]  # Nothing written besides the input
@@ -0,0 +1,278 @@
+# test_core.py
+# ---------------------------------------------------------
+# Grading core: running totals, batch engine, target solver.
+# ---------------------------------------------------------
+
+import random
+
+import pytest
+
+from core import (COLOR_DANGER, COLOR_ELITE, COLOR_GOOD, COLOR_LEGENDARY, COLOR_VERY_GOOD, COLOR_WARNING,
+                  DEFAULT_SCALE, ClassificationScale, PackedSubjects, RunningTotals, SubjectData,
+                  SubjectInput, build_subject, build_subject_record, build_subjects, calculate_batch,
+                  calculate_final_average, classify_batch, cohort_statistics, get_classification,
+                  required_grade, required_grades_batch, required_grades_by_subject, subjects_to_arrays,
+                  target_average)
+
+
+def make_subject(index, coeff, grades):
+    s = SubjectData(index, f"Subject {index}", coeff, grades)
+    s.calculate()
+    return s
+
+
+def test_running_totals_land_exactly_on_tier_bound():
+    rng = random.Random(0)
+    for _ in range(2000):
+        totals = RunningTotals()
+        n = rng.randint(1, 8)
+        # Random edits first, then every subject ends at 14.0
+        for _ in range(rng.randint(1, 30)):
+            i = rng.randint(1, n)
+            grades = [rng.uniform(0, 20) for _ in range(rng.randint(1, 4))]
+            totals.set(i, make_subject(i, rng.randint(1, 10), grades))
+        for i in range(1, n + 1):
+            totals.set(i, make_subject(i, rng.randint(1, 10), [14.0]))
+        assert totals.final_average == 14.0
+        assert get_classification(totals.final_average)[0] == "Very Good"
+
+
+def test_running_totals_remove_and_clear():
+    totals = RunningTotals()
+    totals.set(1, make_subject(1, 2, [10.0]))
+    totals.set(2, make_subject(2, 1, [16.0]))
+    assert totals.final_average == 12.0
+    totals.set(1, None)
+    assert totals.final_average == 16.0 and totals.total_c == 1
+    totals.clear()
+    assert totals.final_average == 0 and totals.ordered() == []
+
+
+def test_running_totals_update_calculates_and_drops_invalid_inputs():
+    totals = RunningTotals()
+    totals.update(1, SubjectInput(1, "Math", "2", ["10"]).to_subject())
+    totals.update(2, SubjectInput(2, "Art", "1", ["16"]).to_subject())
+    assert totals.final_average == 12.0
+    with pytest.raises(ValueError):
+        SubjectInput(2, "Art", "1", ["abc"]).to_subject()
+    totals.update(2, None)  # What the input view does with an input that failed validation
+    assert totals.final_average == 10.0 and totals.total_c == 2
+
+
+# --- PACKED SUBJECTS ---
+
+def test_packed_subjects_match_subject_data():
+    rng = random.Random(4)
+    cohort = [[SubjectData(j, f"Subject {j}", rng.randint(1, 10),
+                           [round(rng.uniform(0, 20), 2) for _ in range(rng.randint(1, 4))])
+               for j in range(1, rng.randint(2, 12))] for _ in range(500)]
+    cohort.append([SubjectData(j, f"Subject {j}", coeff, grades) for j, (coeff, grades) in enumerate(
+        [(3, [14.81, 8.43]), (3, [9.81]), (6, [5.59, 11.78]), (5, [13.01, 17.92, 11.43])], start=1)])
+    packed = PackedSubjects.from_subjects(s for subjects in cohort for s in subjects)
+    start = 0
+    for subjects in cohort:
+        stop = start + len(subjects)
+        assert packed.final_average(start, stop) == calculate_final_average(subjects)
+        views = packed.views(start, stop)
+        assert [(v.index, v.name, v.coeff, v.grades, v.average, v.weighted_score) for v in views] == \
+               [(s.index, s.name, s.coeff, s.grades, s.average, s.weighted_score) for s in subjects]
+        start = stop
+    assert packed.final_average(start - 4, start) == 11.0
+
+
+def test_packed_subjects_indexing():
+    packed = PackedSubjects.from_subjects([make_subject(1, 2, [10.0]), make_subject(2, 1, [16.0, 18.0])])
+    assert packed[-1].name == "Subject 2" and packed[-1].average == 17.0
+    assert packed[-2].index == packed[0].index == 1
+    assert [v.name for v in packed] == ["Subject 1", "Subject 2"]
+    for i in (2, -3):
+        with pytest.raises(IndexError):
+            packed[i]
+
+
+# --- CLASSIFICATION ---
+
+def if_chain_classification(average):
+    """get_classification before the tier table, kept as the reference for the bounds."""
+    if average < 10: return "Insufficient", COLOR_DANGER
+    if average < 11: return "Out of Danger Zone", COLOR_WARNING
+    if average < 14: return "Good", COLOR_GOOD
+    if average < 16: return "Very Good", COLOR_VERY_GOOD
+    if average < 18: return "Legendary", COLOR_LEGENDARY
+    return "Elite Mind", COLOR_ELITE
+
+
+def test_classification_bounds_match_the_if_chain():
+    averages = [0, 9.99, 10, 10.5, 10.999999999999998, 11, 13.99, 14, 15.99, 16, 17.99, 18, 20]
+    for avg in averages:
+        assert get_classification(avg) == if_chain_classification(avg)
+    _, labels, colors = classify_batch(averages)
+    assert list(zip(labels, colors)) == [if_chain_classification(avg) for avg in averages]
+
+
+def test_classify_batch_matches_scalar():
+    rng = random.Random(2)
+    averages = [round(rng.uniform(0, 20), 2) for _ in range(2000)]
+    indices, labels, _ = classify_batch(averages)
+    assert list(labels) == [get_classification(avg)[0] for avg in averages]
+    assert list(indices) == [DEFAULT_SCALE.tier_index(avg) for avg in averages]
+
+
+def test_custom_tier_table():
+    scale = ClassificationScale([(12, "Pass", "#00ff00"), (0, "Fail", "#ff0000"), (16, "Honours", "#0000ff")])
+    assert scale.labels == ["Fail", "Pass", "Honours"]
+    labels = [get_classification(avg, scale)[0] for avg in (0, 11.99, 12, 15.99, 16, 20)]
+    assert labels == ["Fail", "Fail", "Pass", "Pass", "Honours", "Honours"]
+    assert list(classify_batch([11.99, 12, 16], scale)[1]) == ["Fail", "Pass", "Honours"]
+    assert get_classification(12, scale)[1] == "#00ff00"
+
+# --- VALIDATION ---
+
+@pytest.mark.parametrize("coeff, grades, message", [
+    (2.5, [12], "Invalid coefficient"),
+    ("2.5", [12], "Invalid coefficient"),
+    (0, [12], "Must be 1-10"),
+    (11, [12], "Must be 1-10"),
+    (True, [12], "Invalid coefficient"),
+    (2, 12, "Must be a list"),
+    (2, "12;15", "Must be a list"),
+    (2, [21], "Must be 0-20"),
+    (2, [""], "Must be 0-20"),
+    (2, [], "At least one is needed"),
+])
+def test_build_subject_rejects(coeff, grades, message):
+    with pytest.raises(ValueError, match=message):
+        build_subject(1, "Math", coeff, grades)
+
+
+def test_build_subject_accepts_whole_numbers():
+    assert build_subject(1, "Math", 2.0, ["12", 15]).coeff == 2
+    assert build_subject(1, "Math", "10", [14]).coeff == 10
+
+
+def test_build_subject_record_rejects_non_objects():
+    with pytest.raises(ValueError, match="must be an object"):
+        build_subject_record(3, ["Math", 2, [12]])
+
+
+def test_missing_grades_and_empty_subject_lists_are_rejected():
+    with pytest.raises(ValueError, match="No grades in 'Math'"):
+        build_subject_record(1, {"name": "Math", "coeff": 2})
+    with pytest.raises(ValueError, match="No subjects"):
+        build_subjects([])
+
+
+# --- BATCH ENGINE ---
+
+def test_calculate_batch_matches_scalar_calculation():
+    rng = random.Random(1)
+    cohort = [[SubjectData(j, f"Subject {j}", rng.randint(1, 10),
+                           [round(rng.uniform(0, 20), 2) for _ in range(rng.randint(1, 4))])
+               for j in range(1, rng.randint(2, 12))] for _ in range(2000)]
+    # Sums to 11.0 exactly; a rounded NumPy total gives 10.999999999999998 ("Out of Danger Zone")
+    cohort.append([SubjectData(j, f"Subject {j}", coeff, grades) for j, (coeff, grades) in enumerate(
+        [(3, [14.81, 8.43]), (3, [9.81]), (6, [5.59, 11.78]), (5, [13.01, 17.92, 11.43])], start=1)])
+    for n in {len(s) for s in cohort}:
+        group = [s for s in cohort if len(s) == n]
+        averages, weighted, final_averages = calculate_batch(*subjects_to_arrays(group))
+        labels = classify_batch(final_averages)[1]
+        for i, subjects in enumerate(group):
+            expected = calculate_final_average(subjects)
+            assert final_averages[i] == expected
+            assert labels[i] == get_classification(expected)[0]
+            assert averages[i].tolist() == [s.average for s in subjects]
+            assert weighted[i].tolist() == [s.weighted_score for s in subjects]
+    assert calculate_final_average(cohort[-1]) == 11.0
+
+
+# --- COHORT STATISTICS ---
+
+def test_cohort_statistics_align_subjects_by_name():
+    cohort = [
+        [make_subject(1, 2, [10.0]), make_subject(2, 1, [16.0])],
+        [make_subject(2, 1, [12.0]), make_subject(1, 2, [14.0])],  # Same subjects, other order
+        [make_subject(1, 3, [18.0])],  # Subject 2 missing
+    ]
+    stats = cohort_statistics(cohort)
+    assert stats["subject_names"] == ["Subject 1", "Subject 2"]
+    assert list(stats["counts"]) == [3, 2]
+    assert list(stats["mean"]) == pytest.approx([14.0, 14.0])
+    assert list(stats["median"]) == pytest.approx([14.0, 14.0])
+    assert list(stats["final_averages"]) == pytest.approx([calculate_final_average(s) for s in cohort])
+    assert list(stats["labels"]) == ["Good", "Good", "Elite Mind"]
+
+
+# --- TARGET SOLVER ---
+
+def random_student(rng, n_subjects=4):
+    subjects = [SubjectData(j, f"Subject {j}", rng.randint(1, 10),
+                            [round(rng.uniform(0, 20), 2) for _ in range(rng.randint(1, 3))])
+                for j in range(1, n_subjects + 1)]
+    return subjects, [rng.randint(0, 2) for _ in subjects]
+
+
+def final_with(subjects, remaining, fills):
+    """Final average once the remaining exams are sat, through the app's own calculation."""
+    trial = [SubjectData(s.index, s.name, s.coeff, list(s.grades) + [g] * r)
+             for s, r, g in zip(subjects, remaining, fills)]
+    return calculate_final_average(trial)
+
+
+@pytest.mark.parametrize("target", ["Good", "Very Good", "Legendary"])
+def test_required_grade_round_trip(target):
+    rng = random.Random(7)
+    goal = target_average(target)
+    for _ in range(1500):
+        subjects, remaining = random_student(rng)
+        grade = required_grade(subjects, remaining, target)
+        if grade is None:
+            assert final_with(subjects, remaining, [20.0] * len(subjects)) < goal
+            continue
+        assert 0 <= grade <= 20
+        assert final_with(subjects, remaining, [grade] * len(subjects)) >= goal
+
+
+@pytest.mark.parametrize("target", ["Good", "Very Good"])
+def test_required_grades_by_subject_round_trip(target):
+    rng = random.Random(11)
+    goal = target_average(target)
+    for _ in range(500):
+        subjects, remaining = random_student(rng)
+        current = [sum(s.grades) / len(s.grades) for s in subjects]
+        for j, grade in enumerate(required_grades_by_subject(subjects, remaining, target)):
+            if grade is None: continue
+            fills = current[:j] + [grade] + current[j + 1:]
+            assert final_with(subjects, remaining, fills) >= goal
+
+
+def test_required_grades_batch_round_trip():
+    import numpy as np
+
+    rng = random.Random(3)
+    cohort, remaining = zip(*(random_student(rng) for _ in range(2000)))
+    grades, mask, coeffs = subjects_to_arrays(list(cohort), 3)
+    remaining = np.array(remaining)
+    uniform, _ = required_grades_batch(grades, mask, remaining, coeffs, "Very Good")
+
+    solved = ~np.isnan(uniform)
+    extra = np.arange(2) < remaining[..., None]
+    fills = np.broadcast_to(np.nan_to_num(uniform)[:, None, None], extra.shape)
+    finals = calculate_batch(np.concatenate([grades, fills], axis=2), np.concatenate([mask, extra], axis=2),
+                             coeffs)[2]
+    assert (finals[solved] >= 14.0).all()
+    assert solved.any() and (~solved).any()
+
+
+@pytest.mark.parametrize("n_subjects", [1, 4, 10])
+def test_required_grades_batch_matches_scalar(n_subjects):
+    import numpy as np
+
+    rng = random.Random(n_subjects)
+    cohort, remaining = zip(*(random_student(rng, n_subjects) for _ in range(1000)))
+    grades, mask, coeffs = subjects_to_arrays(list(cohort), 3)
+    as_list = lambda values: [None if np.isnan(v) else float(v) for v in values]
+    for target in ["Good", "Very Good"]:
+        uniform, by_subject = required_grades_batch(grades, mask, np.array(remaining), coeffs, target)
+        for i, (subjects, left) in enumerate(zip(cohort, remaining)):
+            assert as_list([uniform[i]]) == [required_grade(subjects, left, target)]
+            assert as_list(by_subject[i]) == required_grades_by_subject(subjects, left, target)
@@ -0,0 +1,102 @@
+# test_grading_service.py
+# ---------------------------------------------------------
+# Local HTTP service, exercised on localhost (port 0 = any free port).
+# ---------------------------------------------------------
+
+import json
+import socket
+import urllib.error
+import urllib.request
+
+import pytest
+
+from grading_service import GradingService
+
+STUDENT = {"student": "a1", "subjects": [{"name": "Math", "coeff": 4, "grades": [12, 15]},
+                                         {"name": "Art", "coeff": 1, "grades": [18]}]}
+
+
+@pytest.fixture(scope="module")
+def service():
+    service = GradingService(port=0, workers=1, max_queue=8).start()
+    yield service
+    service.stop()
+
+
+def request(service, path, payload=None):
+    data = None if payload is None else json.dumps(payload).encode("utf-8")
+    req = urllib.request.Request(service.url + path, data, {"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=60) as resp:
+            return resp.status, resp.read(), resp.headers
+    except urllib.error.HTTPError as e:
+        return e.code, e.read(), e.headers
+
+
+def test_compute_single_student(service):
+    status, body, _ = request(service, "/compute", STUDENT)
+    result = json.loads(body)
+    assert status == 200
+    assert result["average"] == pytest.approx(14.4) and result["classification"] == "Very Good"
+
+
+def test_compute_batch_keeps_invalid_students(service):
+    bad = {"student": "b", "subjects": [{"name": "Math", "grades": 12}]}
+    status, body, _ = request(service, "/compute", {"students": [STUDENT, bad]})
+    results = json.loads(body)
+    assert status == 200
+    assert results[0]["error"] is None and "Must be a list" in results[1]["error"]
+
+
+def test_compute_rejects_malformed_grades(service):
+    status, body, _ = request(service, "/compute", {"student": "b", "subjects": [{"name": "Math", "grades": 12}]})
+    assert status == 400 and "Must be a list" in json.loads(body)["error"]
+
+
+def test_compute_rejects_student_without_subjects(service):
+    status, body, _ = request(service, "/compute", {"student": "e"})
+    assert status == 400 and "No subjects" in json.loads(body)["error"]
+
+
+def test_compute_list_of_one_invalid_student_keeps_its_error(service):
+    bad = {"student": "b", "subjects": [{"name": "Math", "grades": 12}]}
+    status, body, _ = request(service, "/compute", {"students": [bad]})
+    assert status == 200 and "Must be a list" in json.loads(body)[0]["error"]
+
+
+def test_compute_and_report_agree_at_tier_bound(service):
+    # Averages exactly 11.0: a rounded batch total would give 10.999999999999998
+    student = {"student": "t", "subjects": [
+        {"name": f"S{i}", "coeff": coeff, "grades": grades} for i, (coeff, grades) in enumerate(
+            [(3, [14.81, 8.43]), (3, [9.81]), (6, [5.59, 11.78]), (5, [13.01, 17.92, 11.43])])]}
+    _, body, _ = request(service, "/compute", student)
+    _, _, headers = request(service, "/report", student)
+    assert json.loads(body)["classification"] == headers["X-Classification"] == "Good"
+
+
+def test_negative_content_length_is_rejected(service):
+    host, port = service.server.server_address[:2]
+    with socket.create_connection((host, port), timeout=5) as sock:
+        sock.sendall(b"POST /compute HTTP/1.1\r\nHost: x\r\nContent-Length: -1\r\n\r\n")
+        assert sock.recv(1024).startswith(b"HTTP/1.1 400")
+
+
+def test_compute_rejects_batch_larger_than_queue(service):
+    status, _, _ = request(service, "/compute", {"students": [STUDENT] * 9})
+    assert status == 413
+
+
+def test_report_returns_pdf(service):
+    status, body, headers = request(service, "/report", STUDENT)
+    assert status == 200 and body.startswith(b"%PDF")
+    assert headers["X-Classification"] == "Very Good"
+
+
+def test_metrics(service):
+    request(service, "/compute", STUDENT)
+    status, body, _ = request(service, "/metrics")
+    metrics = json.loads(body)
+    assert status == 200
+    assert metrics["queue"]["compute_depth"] == 0
+    assert metrics["latency"]["/compute"]["count"] >= 1
+    assert metrics["batches"]["students"] >= 1
@@ -0,0 +1,61 @@
+# test_headless.py
+# ---------------------------------------------------------
+# Headless runner: one malformed student never stops the cohort.
+# ---------------------------------------------------------
+
+import json
+
+from headless import grade_cohort, main, read_cohort
+from result_cache import ResultCache
+
+
+def test_malformed_students_become_errors(tmp_path, capsys):
+    cohort = [
+        {"student": "a", "subjects": [{"name": "Math", "coeff": 2, "grades": 12}]},
+        {"student": "b", "subjects": ["Math"]},
+        {"student": "c", "subjects": None},
+        7,
+        {"student": "ok", "subjects": [{"name": "Math", "coeff": 2, "grades": [12, 16]}]},
+    ]
+    path = tmp_path / "cohort.json"
+    path.write_text(json.dumps(cohort), encoding="utf-8")
+
+    results = grade_cohort(read_cohort(str(path)))
+    assert [r.error is None for r in results] == [False, False, False, False, True]
+    assert results[-1].average == 14.0
+
+    assert main([str(path), "-f", "csv"]) == 1
+    assert "ok,14.00,Very Good," in capsys.readouterr().out
+
+
+def test_cohort_pdf_with_different_subject_lists(tmp_path):
+    cohort = [
+        {"student": "a", "subjects": [{"name": "Math", "coeff": 2, "grades": [12]},
+                                      {"name": "Art", "coeff": 1, "grades": [15]}]},
+        {"student": "b", "subjects": [{"name": "Art", "coeff": 1, "grades": [9]}]},
+    ]
+    path = tmp_path / "cohort.json"
+    path.write_text(json.dumps(cohort), encoding="utf-8")
+    target = tmp_path / "cohort.pdf"
+
+    assert main([str(path), "-f", "cohort", "-o", str(target)]) == 0
+    assert target.read_bytes().startswith(b"%PDF")
+
+
+def test_cache_dir_reuses_results_across_runs(tmp_path, capsys):
+    cohort = [{"student": "a", "subjects": [{"name": "Math", "coeff": 2, "grades": [12, 15]}]}]
+    path = tmp_path / "cohort.json"
+    path.write_text(json.dumps(cohort), encoding="utf-8")
+    cache_dir = tmp_path / "cache"
+
+    assert main([str(path), "-c", str(cache_dir)]) == 0
+    first = capsys.readouterr().out
+    assert len(list(cache_dir.glob("*.json"))) == 1
+
+    cache = ResultCache(disk_dir=str(cache_dir))
+    results = grade_cohort(read_cohort(str(path)), cache)
+    assert cache.stats()["disk_hits"] == 1 and cache.stats()["misses"] == 0
+    assert results[0].average == 13.5 and results[0].subjects[0].average == 13.5
+
+    assert main([str(path), "-c", str(cache_dir)]) == 0
+    assert capsys.readouterr().out == first
@@ -0,0 +1,21 @@
+# test_main.py
+# ---------------------------------------------------------
+# App helpers that do not need a running Flet page.
+# ---------------------------------------------------------
+
+from concurrent.futures import ThreadPoolExecutor
+
+from main import create_report_file
+
+
+def test_concurrent_exports_get_distinct_files(tmp_path):
+    def claim(i):
+        with create_report_file(str(tmp_path)) as f:
+            f.write(str(i).encode())
+        return f.name
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        names = list(pool.map(claim, range(16)))
+
+    assert len(set(names)) == 16
+    assert sorted(p.read_text() for p in tmp_path.iterdir()) == sorted(str(i) for i in range(16))
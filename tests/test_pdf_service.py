@@ -0,0 +1,86 @@
+# test_pdf_service.py
+# ---------------------------------------------------------
+# PDF rendering, checked on the text drawn into each page.
+# ---------------------------------------------------------
+
+import io
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+from reportlab import rl_config
+
+from core import PackedSubjects, SubjectData, calculate_final_average, get_classification
+from pdf_service import PDFReportGenerator
+
+
+def make_subjects(spec):
+    subjects = [SubjectData(j, f"Subject {j}", coeff, grades) for j, (coeff, grades) in enumerate(spec, start=1)]
+    for s in subjects:
+        s.calculate()
+    return subjects
+
+
+@pytest.fixture
+def page_texts(monkeypatch):
+    """Renders through a callback and returns the strings drawn on each page (form XObjects excluded)."""
+    monkeypatch.setattr(rl_config, "pageCompression", 0)  # Plain content streams, readable below
+
+    def render(draw):
+        buffer = io.BytesIO()
+        draw(buffer)
+        streams = re.findall(rb"stream\r?\n(.*?)endstream", buffer.getvalue(), re.S)
+        texts = [[t.decode("latin-1") for t in re.findall(rb"\((.*?)\) Tj", s)] for s in streams]
+        return [t for t in texts if "/ 20" in t]
+
+    return render
+
+
+def test_generate_accepts_packed_views(page_texts, tmp_path):
+    subjects = make_subjects([(4, [12.0, 15.5]), (2, [9.0])])
+    views = PackedSubjects.from_subjects(subjects).views()
+    avg = calculate_final_average(subjects)
+    label = get_classification(avg)[0]
+    generator = PDFReportGenerator()
+
+    assert generator.generate(views, avg, label, str(tmp_path / "packed.pdf")) == (True, "Success")
+    assert page_texts(lambda out: generator.generate(views, avg, label, out)) == \
+           page_texts(lambda out: generator.generate(subjects, avg, label, out))
+
+
+def test_forms_only_when_they_make_the_report_smaller():
+    def size(n_subjects, use_forms):
+        subjects = make_subjects([(2, [12.0, 14.0])] * n_subjects)
+        return len(PDFReportGenerator(use_forms).render_bytes(subjects, 13.0, "Good"))
+
+    long_report = 16 * PDFReportGenerator.ROWS_PER_PAGE  # 17 pages
+    assert size(long_report, True) < size(long_report, False)
+    assert size(long_report, None) == size(long_report, True)
+    assert size(1, False) < size(1, True)
+    assert size(1, None) == size(1, False)
+
+
+def test_cohort_pages_show_each_students_own_badge(page_texts):
+    students = [
+        # Exactly 11.0 "Good"; a rounded batch total would print "OUT OF DANGER ZONE"
+        ("alice", make_subjects([(3, [14.81, 8.43]), (3, [9.81]), (6, [5.59, 11.78]), (5, [13.01, 17.92, 11.43])])),
+        ("bob", make_subjects([(1, [18.0])])),
+        ("carol", make_subjects([(2, [9.0, 10.0]), (1, [5.0])])),
+    ]
+    pages = page_texts(lambda out: PDFReportGenerator().render_cohort(students, out))
+
+    assert pages[0][3] == "CLASS SUMMARY"
+    assert [page[:4] for page in pages[1:]] == [
+        ["11.00", "/ 20", "PERFORMANCE: GOOD", "alice"],
+        ["18.00", "/ 20", "PERFORMANCE: ELITE MIND", "bob"],
+        ["8.00", "/ 20", "PERFORMANCE: INSUFFICIENT", "carol"],
+    ]
+
+
+def test_rendering_does_not_import_the_ui_export_module():
+    code = "import sys, pdf_service, bulk_reports; print('export_jobs' in sys.modules)"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True).stdout
+    assert out.strip() == "False"
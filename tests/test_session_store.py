@@ -0,0 +1,56 @@
+# test_session_store.py
+# ---------------------------------------------------------
+# Session store: compact round trip and bounded disk growth.
+# ---------------------------------------------------------
+
+import time
+
+from core import SubjectData
+from session_store import SessionStore, pack_subjects, unpack_subjects
+
+
+def make_subjects():
+    subjects = [SubjectData(1, "Math", 4, [12.0, 15.5]), SubjectData(2, "Économie", 2, [])]
+    for s in subjects:
+        s.calculate()
+    return subjects
+
+
+def test_pack_round_trip():
+    restored = unpack_subjects(pack_subjects(make_subjects()))
+    assert [(s.name, s.coeff, s.grades, s.average) for s in restored] == \
+           [("Math", 4, [12.0, 15.5], 13.75), ("Économie", 2, [], 0.0)]
+
+
+def test_history_is_capped_per_key(tmp_path):
+    store = SessionStore(str(tmp_path / "s.db"), max_history=3)
+    for i in range(10):
+        store.save("device", make_subjects(), 10.0 + i, "Good")
+    history = store.history("device", limit=100)
+    assert [r.average for r in history] == [19.0, 18.0, 17.0]
+    store.close()
+
+
+def test_results_survive_reopening(tmp_path):
+    path = str(tmp_path / "s.db")
+    store = SessionStore(path)
+    store.save("device", make_subjects(), 13.7, "Good")
+    store.close()
+
+    store = SessionStore(path)
+    record = store.load("device")
+    assert record.average == 13.7 and record.subjects[0].name == "Math"
+    store.close()
+
+
+def test_prune_drops_stale_sessions(tmp_path):
+    store = SessionStore(str(tmp_path / "s.db"))
+    store.save("old", make_subjects(), 12.0, "Good")
+    store.save("new", make_subjects(), 12.0, "Good")
+    store._conn.execute("UPDATE sessions SET saved_at = ? WHERE key = 'old'", (time.time() - 1000,))
+    store._conn.execute("UPDATE history SET saved_at = ? WHERE key = 'old'", (time.time() - 1000,))
+
+    assert store.prune(max_age=500) == 1
+    assert store.load("old") is None and store.history("old") == []
+    assert store.load("new") is not None
+    store.close()
@@ -0,0 +1,46 @@
+# test_stream_pipeline.py
+# ---------------------------------------------------------
+# Streaming pipeline: bad rows go to the reject stream, never abort the run.
+# ---------------------------------------------------------
+
+import io
+import json
+
+from stream_pipeline import run_pipeline
+
+
+def test_malformed_jsonl_rows_are_rejected():
+    lines = [
+        {"student": "a", "subjects": None},
+        {"student": "b", "subject": "Math", "coeff": 2, "grades": 12},
+        {"student": "c", "subjects": [7]},
+        {"student": "d", "subject": "Math", "coeff": 2.5, "grades": [12]},
+        {"student": "ok", "subjects": [{"name": "Math", "coeff": 2, "grades": [12, 16]}]},
+    ]
+    source = io.StringIO("\n".join(json.dumps(rec) for rec in lines) + "\nnot json\n")
+    out, rejects = io.StringIO(), io.StringIO()
+
+    assert run_pipeline(source, out, rejects, fmt="jsonl") == (1, 5)
+    assert [json.loads(line)["student"] for line in out.getvalue().splitlines()] == ["ok"]
+    rejected = [json.loads(line) for line in rejects.getvalue().splitlines()]
+    assert [r["student"] for r in rejected] == ["a", "b", "c", "d", None]
+    assert rejected[0]["error"] == "'subjects' must be a list."
+
+
+def test_csv_rows_grouped_by_student():
+    source = io.StringIO("student,subject,coeff,grades\ns1,Math,2,12;16\ns1,Art,1,15\ns2,Math,0,10\n")
+    out, rejects = io.StringIO(), io.StringIO()
+
+    assert run_pipeline(source, out, rejects, fmt="csv") == (1, 1)
+    assert json.loads(out.getvalue())["average"] == 43 / 3
+    assert json.loads(rejects.getvalue())["student"] == "s2"
+
+
+def test_csv_blank_grades_cell_is_rejected():
+    source = io.StringIO("student,subject,coeff,grades\ns1,Math,4,\ns1,Art,1,20\ns2,Art,1,20\n")
+    out, rejects = io.StringIO(), io.StringIO()
+
+    assert run_pipeline(source, out, rejects, fmt="csv") == (1, 1)
+    assert json.loads(out.getvalue())["student"] == "s2"
+    reject = json.loads(rejects.getvalue())
+    assert (reject["line"], reject["student"]) == (2, "s1") and "No grades in 'Math'" in reject["error"]
@@ -0,0 +1,45 @@
+# test_update_scheduler.py
+# ---------------------------------------------------------
+# Batched UI updates: coalescing and skipped counts on a fake page.
+# ---------------------------------------------------------
+
+from update_scheduler import UpdateScheduler
+
+
+class FakePage:
+    def __init__(self):
+        self.calls = []
+
+    def update(self, *controls):
+        self.calls.append(controls)
+
+
+class FakeControl:
+    def __init__(self, page=None):
+        self.page = page
+
+
+def test_window_coalesces_into_one_update():
+    page = FakePage()
+    slider, badge, unmounted = FakeControl(page), FakeControl(page), FakeControl()
+    scheduler = UpdateScheduler(page, window=60)  # Flushed by hand, the timer never fires
+    for _ in range(20):
+        scheduler.schedule(slider)
+    scheduler.schedule(badge, slider)
+    scheduler.schedule(unmounted)
+    assert page.calls == []
+
+    scheduler.flush()
+    assert page.calls == [(slider, badge)]
+    assert scheduler.stats() == {"requested": 23, "emitted": 1, "coalesced": 21, "skipped": 1}
+
+
+def test_zero_window_pushes_immediately():
+    page = FakePage()
+    control = FakeControl(page)
+    scheduler = UpdateScheduler(page, window=0)
+    scheduler.schedule(control)
+    scheduler.schedule(control)
+    scheduler.schedule(FakeControl())
+    assert page.calls == [(control,), (control,)]
+    assert scheduler.stats() == {"requested": 3, "emitted": 2, "coalesced": 0, "skipped": 1}
@@ -0,0 +1,79 @@
+# update_scheduler.py
+# ---------------------------------------------------------
+# BATCHED UI UPDATES
+# Coalesces control updates into one page.update(*controls)
+# per time window instead of a full page diff per event.
+# No flet import needed: works with any page-like object.
+# ---------------------------------------------------------
+
+import threading
+
+DEFAULT_WINDOW = 1 / 60  # One frame
+
+
+class UpdateScheduler:
+    """
+    Collects controls that changed and pushes them together.
+    Scheduling a control that is already pending costs nothing extra,
+    so a slider dragging through 20 values inside one window becomes a single update.
+    """
+
+    def __init__(self, page, window=DEFAULT_WINDOW):
+        """
+        :param page: Object with update(*controls) (ft.Page)
+        :param window: Seconds to wait for more changes before pushing (0 pushes immediately)
+        """
+        self.page = page
+        self.window = window
+        self._pending = {}  # id(control) -> [control, schedule requests], in scheduling order
+        self._timer = None
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.requested = 0  # Controls passed to schedule()
+        self.emitted = 0  # page.update() calls actually made
+        self.coalesced = 0  # Requests absorbed into another request's update
+        self.skipped = 0  # Requests for controls that were not on the page
+
+    def schedule(self, *controls):
+        """Marks controls as changed. They are pushed at the end of the current window."""
+        if not controls: return
+        with self._lock:
+            for c in controls:
+                self._pending.setdefault(id(c), [c, 0])[1] += 1
+            self.requested += len(controls)
+            if self._timer is not None:
+                return
+            if self.window > 0:
+                self._timer = threading.Timer(self.window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+                return
+        self.flush()
+
+    def flush(self):
+        """Pushes every pending control now (controls not on the page yet are skipped)."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            entries = list(self._pending.values())
+            self._pending.clear()
+
+        mounted, requests, skipped = [], 0, 0
+        for c, n in entries:
+            if c.page:
+                mounted.append(c)
+                requests += n
+            else:
+                skipped += n
+        with self._lock:
+            self.skipped += skipped
+            if mounted:
+                self.emitted += 1
+                self.coalesced += requests - 1
+        if mounted: self.page.update(*mounted)
+
+    def stats(self):
+        return {"requested": self.requested, "emitted": self.emitted, "coalesced": self.coalesced,
+                "skipped": self.skipped}